@@ -2,58 +2,394 @@
 Day 1 of Advent of Code 2024
 https://adventofcode.com/2024/day/1
 """
+import bisect
+import math
+import operator
 import os
 import sys
+from array import array
+from collections import Counter
 
-left = []
-right = []
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import INT_TYPECODE, open_input  # pylint: disable=wrong-import-position
 
-def read_input(file_name) -> None:
+# Lists at least this long use numpy, when it is installed, unless told otherwise
+NUMPY_MIN_PAIRS = 100_000
+
+def read_input(file_name) -> tuple:
     """
     Read input file
     Data consists of two numbers separated by 3 spaces
-    Function loads the numbers into two arrays (left and right)
+    Function parses the numbers straight from the mapped file into
+    two integer arrays (left and right)
     """
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            pair = line.split("   ")
-            left.append(int(pair[0]))
-            right.append(int(pair[1]))
+    return open_input(file_name, os.path.dirname(__file__)).int_columns(2)
 
+def get_numpy(pairs:int, use_numpy:bool = None):
+    """ Returns numpy if it should be used for lists of this length, otherwise None
+        use_numpy of None picks numpy for long lists if it is installed,
+        True insists on numpy and False never uses it
+    """
+    if use_numpy is False or (use_numpy is None and pairs < NUMPY_MIN_PAIRS):
+        return None
+    try:
+        import numpy as np   # pylint: disable=import-outside-toplevel
+    except ImportError:
+        if use_numpy:
+            raise
+        return None
+    return np
 
-def calculate_distance() -> int:
+def calculate_distance(left, right, use_numpy:bool = None) -> int:
     """ Calculates the absolute distance between pairs of numbers
         Distance is the absolute difference between equivalent values
-        in the left and right list. 
+        in the left and right list, once both lists are sorted. O(n log n)
+    Args:
+        left, right: The two lists of integers, e.g. arrays from read_input
+        use_numpy (bool): Use numpy for the sort and sum, see get_numpy
     Returns:
         int: The sum of the distances
     """
-    distance = 0
-    left.sort()
-    right.sort()
-    items = len(left)
-    for i in range(0,items):
-        delta = abs(left[i]-right[i])
-        distance += delta
-    return distance
-
-def calculate_similarity() -> int:
+    np = get_numpy(len(left), use_numpy)
+    if np is not None:
+        left = np.sort(np.asarray(left, dtype=np.int64))
+        right = np.sort(np.asarray(right, dtype=np.int64))
+        return int(np.abs(left - right).sum())
+    # Sort one column at a time and pack it back into an array of machine
+    # integers so only one list of int objects is alive at once
+    left = array(INT_TYPECODE, sorted(left))
+    right = array(INT_TYPECODE, sorted(right))
+    return sum(map(abs, map(operator.sub, left, right)))
+
+def calculate_similarity(left, right, use_numpy:bool = None) -> int:
     """ Returns the similarity of the two lists
         Similarity is defined as follows:
             For each number in the number in the left list
             count how often that number appears in the right list
             multiply that count by the number
-
+        The right list is counted once, so this is O(n) (O(n log n) with numpy,
+        which counts both lists and joins the counts)
+    Args:
+        left, right: The two lists of integers, e.g. arrays from read_input
+        use_numpy (bool): Use numpy for the counting, see get_numpy
     Returns:
         int: _The sum of the individual similarity scores_
     """
-    similarity = 0
-    for num in left:
-        count = right.count(num)
-        similarity += count * num
-    return similarity
+    np = get_numpy(len(left), use_numpy)
+    if np is not None:
+        left_values, left_counts = np.unique(np.asarray(left, dtype=np.int64), return_counts=True)
+        right_values, right_counts = np.unique(np.asarray(right, dtype=np.int64),
+                                               return_counts=True)
+        values, left_found, right_found = np.intersect1d(left_values, right_values,
+                                                         assume_unique=True, return_indices=True)
+        return int((values * left_counts[left_found] * right_counts[right_found]).sum())
+    counts = Counter(right)
+    return sum(num * counts[num] for num in left if num in counts)
+
+class DifferenceBlock:
+    """ A run of consecutive location IDs, used by LocationLists
+        Each ID x stands for the stretch of the number line up to the next
+        ID, of the given length, over which the count of left values <= x
+        minus the count of right values <= x is value + offset. Adding to
+        every difference in the block only changes offset, and the histogram
+        of lengths by value keeps the sum of length * |difference| current
+    """
+    def __init__(self, ids:list, values:list, lengths:list) -> None:
+        self.ids = ids
+        self.values = values
+        self.lengths = lengths
+        self.offset = 0
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """ Recomputes the histogram and totals after the lists have changed"""
+        self.histogram = {}
+        self.size = 0
+        self.non_negative = 0
+        self.total = 0
+        for value, length in zip(self.values, self.lengths):
+            self.histogram[value] = self.histogram.get(value, 0) + length
+            self.size += length
+            difference = value + self.offset
+            self.total += length * abs(difference)
+            if difference >= 0:
+                self.non_negative += length
+
+    def set(self, index:int, value:int, length:int) -> None:
+        """ Changes the value and length of one ID in O(1)"""
+        old_value = self.values[index]
+        old_length = self.lengths[index]
+        old_difference = old_value + self.offset
+        difference = value + self.offset
+        self.histogram[old_value] -= old_length
+        self.histogram[value] = self.histogram.get(value, 0) + length
+        self.size += length - old_length
+        self.total += length * abs(difference) - old_length * abs(old_difference)
+        self.non_negative += (length if difference >= 0 else 0) - (
+            old_length if old_difference >= 0 else 0)
+        self.values[index] = value
+        self.lengths[index] = length
+
+    def insert(self, index:int, num:int, value:int, length:int) -> None:
+        """ Inserts an ID at a position in the block"""
+        self.ids.insert(index, num)
+        self.values.insert(index, value)
+        self.lengths.insert(index, 0)
+        self.histogram.setdefault(value, 0)
+        self.set(index, value, length)
+
+    def delete(self, index:int) -> None:
+        """ Removes the ID at a position in the block"""
+        self.set(index, self.values[index], 0)
+        del self.ids[index]
+        del self.values[index]
+        del self.lengths[index]
+
+    def shift(self, delta:int) -> int:
+        """ Adds delta (1 or -1) to every difference in the block in O(1)
+        Returns:
+            int: The change in the block's total
+        """
+        if delta > 0:
+            change = 2 * self.non_negative - self.size
+            self.non_negative += self.histogram.get(-self.offset - 1, 0)
+        else:
+            positive = self.non_negative - self.histogram.get(-self.offset, 0)
+            change = self.size - 2 * positive
+            self.non_negative = positive
+        self.offset += delta
+        self.total += change
+        return change
+
+    def add_range(self, start:int, end:int, delta:int) -> int:
+        """ Adds delta (1 or -1) to the differences of the IDs from start up to end
+        Returns:
+            int: The change in the block's total
+        """
+        if start == 0 and end == len(self.ids):
+            return self.shift(delta)
+        histogram = self.histogram
+        values = self.values
+        lengths = self.lengths
+        # Differences at this value cross zero, gaining or losing a non-negative stretch
+        crossing = -1 if delta > 0 else 0
+        change = 0
+        for index in range(start, end):
+            value = values[index]
+            length = lengths[index]
+            histogram[value] -= length
+            histogram[value + delta] = histogram.get(value + delta, 0) + length
+            values[index] = value + delta
+            difference = value + self.offset
+            change += length * (abs(difference + delta) - abs(difference))
+            if difference == crossing:
+                self.non_negative += delta * length
+        self.total += change
+        return change
+
+class LocationLists:
+    """ Left and right location lists that keep their distance and
+        similarity current as pairs are added and removed
+
+        Similarity is kept with a frequency map of each list, O(1) per update.
+        The distance is the area between the step functions counting the
+        left and the right values <= x, so adding a pair (a, b) adds 1 (or
+        -1) to the difference between the counts for every ID from a up to
+        b. IDs are kept in sorted blocks of about sqrt(m) IDs for m distinct
+        IDs, so an update shifts the whole blocks between a and b in O(1)
+        each and walks at most two partial blocks, O(sqrt(m)) in all rather
+        than a re-sort. The blocks are rebuilt in O(m) whenever m has doubled
+        or halved since they were last built, which is O(1) amortised per
+        update. IDs that are no longer in either list are removed, so m only
+        counts IDs still in use
+    """
+    MIN_BLOCK_SIZE = 32
+
+    def __init__(self, left = (), right = ()) -> None:
+        """ Builds the structure from two lists of equal length in O(n log n)"""
+        if len(left) != len(right):
+            raise ValueError("The left and right lists must be the same length")
+        self.left_counts = Counter(left)
+        self.right_counts = Counter(right)
+        self.pairs = len(left)
+        self._similarity = sum(num * count * self.right_counts[num]
+                               for num, count in self.left_counts.items())
+        ids = sorted(self.left_counts.keys() | self.right_counts.keys())
+        values = []
+        lengths = []
+        difference = 0
+        for index, num in enumerate(ids):
+            difference += self.left_counts[num] - self.right_counts[num]
+            values.append(difference)
+            lengths.append(ids[index + 1] - num if index + 1 < len(ids) else 0)
+        self._build_blocks(ids, values, lengths)
+        self._distance = sum(block.total for block in self._blocks)
+
+    def _build_blocks(self, ids:list, values:list, lengths:list) -> None:
+        """ Splits the sorted IDs into blocks of about sqrt(len(ids)) IDs"""
+        self._id_count = len(ids)
+        self._built_count = len(ids)
+        self._block_size = max(self.MIN_BLOCK_SIZE, math.isqrt(len(ids)))
+        size = self._block_size
+        self._blocks = [DifferenceBlock(ids[i:i + size], values[i:i + size], lengths[i:i + size])
+                        for i in range(0, len(ids), size)]
+        self._starts = [block.ids[0] for block in self._blocks]
+
+    def _rebalance(self) -> None:
+        """ Rebuilds the blocks if the number of IDs has doubled or halved since they were built"""
+        most = 2 * max(self._built_count, self.MIN_BLOCK_SIZE)
+        if self._built_count // 2 <= self._id_count <= most:
+            return
+        ids = []
+        values = []
+        lengths = []
+        for block in self._blocks:
+            ids.extend(block.ids)
+            values.extend(value + block.offset for value in block.values)
+            lengths.extend(block.lengths)
+        self._build_blocks(ids, values, lengths)
+
+    def __len__(self) -> int:
+        return self.pairs
+
+    def distance(self) -> int:
+        """ Returns the same total as calculate_distance, in O(1)"""
+        return self._distance
+
+    def similarity(self) -> int:
+        """ Returns the same total as calculate_similarity, in O(1)"""
+        return self._similarity
+
+    def add(self, left:int, right:int) -> None:
+        """ Adds a pair of location IDs"""
+        self._similarity += left * self.right_counts[left]
+        self.left_counts[left] += 1
+        self._similarity += right * self.left_counts[right]
+        self.right_counts[right] += 1
+        self.pairs += 1
+        self._add_id(left)
+        self._add_id(right)
+        self._add_difference(left, right, 1)
+
+    def remove(self, left:int, right:int) -> None:
+        """ Removes a pair of location IDs, the two need not have been added together
+
+        Raises:
+            ValueError: If either ID is not in its list
+        """
+        if self.left_counts[left] == 0 or self.right_counts[right] == 0:
+            raise ValueError(f"({left}, {right}) is not in the location lists")
+        self.right_counts[right] -= 1
+        self._similarity -= right * self.left_counts[right]
+        self.left_counts[left] -= 1
+        self._similarity -= left * self.right_counts[left]
+        self.pairs -= 1
+        self._add_difference(left, right, -1)
+        for num in {left, right}:
+            if self.left_counts[num] == 0 and self.right_counts[num] == 0:
+                del self.left_counts[num]
+                del self.right_counts[num]
+                self._remove_id(num)
+
+    def _find(self, num:int) -> tuple:
+        """ Returns the block holding an ID, or the block it belongs in, and the position in it"""
+        block_index = max(bisect.bisect_right(self._starts, num) - 1, 0)
+        return block_index, bisect.bisect_left(self._blocks[block_index].ids, num)
+
+    def _add_id(self, num:int) -> None:
+        """ Adds an ID to the blocks if it is new, splitting the stretch it falls in"""
+        if not self._blocks:
+            self._blocks.append(DifferenceBlock([num], [0], [0]))
+            self._starts.append(num)
+            self._id_count = 1
+            return
+        block_index, index = self._find(num)
+        block = self._blocks[block_index]
+        if index < len(block.ids) and block.ids[index] == num:
+            return
+        old_total = block.total
+        if index == 0:
+            # Smaller than every ID, so no values are <= num yet
+            value = -block.offset
+            length = block.ids[0] - num
+        else:
+            value = block.values[index - 1]
+            if index < len(block.ids):
+                length = block.ids[index] - num
+            elif block_index + 1 < len(self._blocks):
+                length = self._starts[block_index + 1] - num
+            else:
+                length = 0
+            block.set(index - 1, value, num - block.ids[index - 1])
+        block.insert(index, num, value, length)
+        self._distance += block.total - old_total
+        self._starts[block_index] = block.ids[0]
+        self._id_count += 1
+        if len(block.ids) > 2 * self._block_size:
+            half = len(block.ids) // 2
+            values = [value + block.offset for value in block.values]
+            self._blocks[block_index:block_index + 1] = [
+                DifferenceBlock(block.ids[:half], values[:half], block.lengths[:half]),
+                DifferenceBlock(block.ids[half:], values[half:], block.lengths[half:])]
+            self._starts[block_index:block_index + 1] = [block.ids[0], block.ids[half]]
+        self._rebalance()
+
+    def _remove_id(self, num:int) -> None:
+        """ Removes an ID that is in neither list, joining its stretch to the ID before it
+            Its counts cancel out, so its difference is already that of the ID before it
+        """
+        block_index, index = self._find(num)
+        block = self._blocks[block_index]
+        length = block.lengths[index]
+        old_total = block.total
+        block.delete(index)
+        self._distance += block.total - old_total
+        if index > 0:
+            before_block, before = block, index - 1
+        elif block_index > 0:
+            before_block = self._blocks[block_index - 1]
+            before = len(before_block.ids) - 1
+        else:
+            before_block = None
+        if before_block is not None:
+            # The last ID's stretch runs to infinity and is stored with length 0
+            is_last = index == len(block.ids) and block_index + 1 == len(self._blocks)
+            old_total = before_block.total
+            before_block.set(before, before_block.values[before],
+                             0 if is_last else before_block.lengths[before] + length)
+            self._distance += before_block.total - old_total
+        if block.ids:
+            self._starts[block_index] = block.ids[0]
+        else:
+            del self._blocks[block_index]
+            del self._starts[block_index]
+        self._id_count -= 1
+        self._rebalance()
+
+    def _add_difference(self, left:int, right:int, sign:int) -> None:
+        """ Updates the differences for a pair added (sign 1) or removed (sign -1)"""
+        if left == right:
+            return
+        delta = sign if left < right else -sign
+        first_block, first_index = self._find(min(left, right))
+        last_block, last_index = self._find(max(left, right))
+        if first_block == last_block:
+            self._distance += self._blocks[first_block].add_range(first_index, last_index, delta)
+            return
+        block = self._blocks[first_block]
+        change = block.add_range(first_index, len(block.ids), delta)
+        for block in self._blocks[first_block + 1:last_block]:
+            change += block.shift(delta)
+        change += self._blocks[last_block].add_range(0, last_index, delta)
+        self._distance += change
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return calculate_distance(*read_input(file_name))
 
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return calculate_similarity(*read_input(file_name))
 
 def main():
     """ Main function
@@ -66,9 +402,8 @@ def main():
     else:
         file = sys.argv[1]
 
-    read_input(file)
-    print(calculate_distance())
-    print(calculate_similarity())
+    print(part_1(file))
+    print(part_2(file))
 
 if __name__ == "__main__":
     main()
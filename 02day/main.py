@@ -4,12 +4,29 @@ https://adventofcode.com/2024/day/2
 """
 import os
 import sys
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
+# Allowed difference between neighbouring levels, in either direction
+MIN_STEP = 1
+MAX_STEP = 3
+# Levels the Problem Dampener may remove in part 2
+DAMPENER_REMOVALS = 1
+# Inputs at least this big are checked in batches with numpy, when it is installed
+NUMPY_MIN_BYTES = 1 << 20
+BATCH_BYTES = 1 << 22
+# Byte values the batch parser looks for
+ZERO = ord("0")
+MINUS = ord("-")
+NEWLINE = ord("\n")
+SPACE = ord(" ")
 
 
 
-def read_input(file_name:str) -> list:
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -17,14 +34,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A lazy iterator over the lines of the mapped file, as bytes
     """
-    reports = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            reports.append(line)
-    return reports
+    return open_input(file_name, os.path.dirname(__file__)).lines()
 
 
 def count_safe(reports:list,is_first_problem:bool) -> int: 
@@ -36,7 +48,7 @@ def count_safe(reports:list,is_first_problem:bool) -> int:
     on the value of `is_first_problem`.
 
     Args:
-        reports (list): A list of report strings to be evaluated.
+        reports (iterable): The report lines to be evaluated.
         is_first_problem (bool): A flag indicating which safety check to use.
             If True, uses the basic safety check; otherwise, uses the dampened
             safety check.
@@ -44,14 +56,261 @@ def count_safe(reports:list,is_first_problem:bool) -> int:
     Returns:
         int: The count of reports that are considered safe.
     """
+    removals = 0 if is_first_problem else DAMPENER_REMOVALS
     safety_count = 0
     for report in reports:
-        if is_first_problem:
-            if is_safe(report):
-                safety_count += 1
-        else:
-            if is_safe_with_dampener(report):
-                safety_count +=1
+        if is_safe_levels(get_levels(report), removals):
+            safety_count += 1
+    return safety_count
+
+def get_levels(report) -> list:
+    """ Parses a report line into its list of integer levels"""
+    return [int(n) for n in report.split()]
+
+def is_safe_levels(levels:list, removals:int = 0, min_step:int = MIN_STEP,
+                   max_step:int = MAX_STEP) -> bool:
+    """
+    Determines if a report is safe after removing at most `removals` levels.
+
+    A report is safe if its levels are strictly ascending or descending with
+    each step differing by min_step to max_step units. Works in one pass:
+    for each level it keeps the fewest removals that leave a safe ascending
+    and a safe descending run ending at that level, looking back only
+    removals + 1 levels, so the check is O(n * (removals + 1)).
+
+    Args:
+        levels (list): The parsed levels of the report.
+        removals (int): The most levels that may be removed.
+        min_step (int): The smallest allowed difference between neighbours.
+        max_step (int): The largest allowed difference between neighbours.
+
+    Returns:
+        bool: True if the levels are safe after at most `removals` removals.
+    """
+    level_count = len(levels)
+    if level_count - removals <= 1:
+        return True
+    if removals == 0:
+        # A safe report can only move in the direction of its overall change
+        direction = 1 if levels[-1] >= levels[0] else -1
+        for previous, level in zip(levels, levels[1:]):
+            if not min_step <= (level - previous) * direction <= max_step:
+                return False
+        return True
+    # (level, removals for an ascending run ending there, for a descending run)
+    recent = deque(maxlen=removals + 1)
+    for index, level in enumerate(levels):
+        # Keeping only this level means removing every level before it
+        ascending = descending = index
+        for skipped, (previous, previous_ascending, previous_descending) in enumerate(
+                reversed(recent)):
+            step = level - previous
+            if min_step <= step <= max_step:
+                ascending = min(ascending, previous_ascending + skipped)
+            if min_step <= -step <= max_step:
+                descending = min(descending, previous_descending + skipped)
+        if min(ascending, descending) + level_count - 1 - index <= removals:
+            return True
+        recent.append((level, ascending, descending))
+    return False
+
+_pair_levels = None
+
+def get_pair_levels():
+    """
+    Returns a table of the level read from each pair of bytes, made on first use.
+
+    The table is indexed by the first byte plus 256 times the second, as
+    an int32 numpy array. A pair of digits reads as a two digit level, and
+    a digit followed by any other byte as a one digit level.
+    """
+    import numpy as np   # pylint: disable=import-outside-toplevel
+    global _pair_levels   # pylint: disable=global-statement
+    if _pair_levels is None:
+        first, second = np.divmod(np.arange(1 << 16, dtype=np.int32), 256)[::-1]
+        first -= ZERO
+        second -= ZERO
+        _pair_levels = np.where((second >= 0) & (second <= 9), first * 10 + second, first)
+    return _pair_levels
+
+def parse_reports(block:bytes) -> tuple:
+    """
+    Parses a block of whole report lines into a ragged array with numpy.
+
+    Each run of digits is a level, optionally preceded by a minus sign, and
+    each line break ends a report, so blank lines are reports with no levels.
+    The block is scanned once to find where the runs start; every level is
+    then read from the bytes around its start, so only the few levels of
+    more than two digits are looked at again. A report starts at a level
+    with a line break in front of it, unless some line starts with blanks,
+    when the line breaks before each level are counted instead.
+
+    Args:
+        block (bytes): Report lines, ending with a line break.
+
+    Returns:
+        tuple: The levels of every report in one array, the index of the
+        first level of each report that has levels, and the number of
+        reports including those with no levels.
+    """
+    import numpy as np   # pylint: disable=import-outside-toplevel
+    size = len(block)
+    # A line break in front and spaces behind, so every run has a byte either side
+    padded = np.empty(size + 3, dtype=np.uint8)
+    padded[0] = NEWLINE
+    padded[1:size + 1] = np.frombuffer(block, dtype=np.uint8)
+    padded[size + 1:] = SPACE
+    # Digits sort above the spaces, minus signs and line breaks, so one comparison finds them
+    is_digit = padded >= ZERO
+    # The byte in front of each run of digits
+    befores = np.flatnonzero(np.greater(is_digit[1:], is_digit[:-1]))
+    before = np.take(padded, befores)
+    # The first two bytes of each run read as one little-endian number, the second byte high
+    pairs = np.take(np.ndarray((size + 1,), dtype="<u2", buffer=padded, offset=1, strides=(1,)),
+                    befores)
+    levels = np.take(get_pair_levels(), pairs)
+    is_pair = pairs >= ZERO << 8
+    longer = np.flatnonzero(is_pair & (np.take(padded[3:], befores) >= ZERO))
+    positions = befores[longer] + 3
+    digits = 2
+    while len(longer):
+        digits += 1
+        if digits == 10:
+            levels = levels.astype(np.int64)
+        levels[longer] = levels[longer] * 10 + (padded[positions].astype(levels.dtype) - ZERO)
+        more = padded[positions + 1] >= ZERO
+        longer = longer[more]
+        positions = positions[more] + 1
+    if b"-" in block:
+        negative = before == MINUS
+        levels[negative] *= -1
+        before[negative] = padded[befores[negative] - 1]
+    is_newline = padded == NEWLINE
+    report_count = int(np.count_nonzero(is_newline)) - 1
+    if size and block[-1] != NEWLINE:
+        report_count += 1
+    # Blanks sort below the digits and minus signs too
+    is_blank = np.less_equal(padded[1:size + 1], SPACE) & ~is_newline[1:size + 1]
+    if np.any(is_newline[:size] & is_blank):
+        lines = np.searchsorted(np.flatnonzero(is_newline), befores, "right")
+        report_starts = np.flatnonzero(np.diff(lines, prepend=0))
+    else:
+        report_starts = np.flatnonzero(before == NEWLINE)
+    return levels, report_starts, report_count
+
+def find_safe_reports(levels, report_starts, report_count:int, removals:int = 0,
+                      min_step:int = MIN_STEP, max_step:int = MAX_STEP):
+    """
+    Checks every report in a ragged array at once with numpy.
+
+    Steps are the differences between neighbouring levels of the same report.
+    For the dampener, removing level k drops the steps either side of it and
+    adds the step that joins its neighbours, so each removal is scored from
+    the report's count of bad steps without building the shorter report.
+
+    Args:
+        levels, report_starts, report_count: A ragged array from parse_reports.
+        removals (int): The most levels that may be removed, 0 or 1.
+        min_step (int): The smallest allowed difference between neighbours.
+        max_step (int): The largest allowed difference between neighbours.
+
+    Returns:
+        numpy.ndarray: True for each safe report, those with no levels last.
+
+    Raises:
+        ValueError: If removals is more than 1.
+    """
+    import numpy as np   # pylint: disable=import-outside-toplevel
+    if removals > 1:
+        raise ValueError("Batches can only remove one level, use is_safe_levels")
+    safe = np.ones(report_count, dtype=bool)
+    if len(levels) == 0:
+        return safe
+    # Reports with no levels are always safe
+    checked = safe[:len(report_starts)]
+    checked[:] = False
+    # The step after the last level of a report leads into the next one
+    is_last = np.zeros(len(levels), dtype=bool)
+    is_last[report_starts[1:] - 1] = True
+    is_last[-1] = True
+    not_last = ~is_last
+    steps = np.zeros(len(levels), dtype=levels.dtype)
+    np.subtract(levels[1:], levels[:-1], out=steps[:-1])
+    bad_steps = []
+    for direction in (1, -1):
+        moves = steps * direction
+        bad = (moves < min_step) | (moves > max_step)
+        bad &= not_last
+        bad_steps.append(bad)
+    if removals == 0:
+        # Bit 0 for a bad ascending step and bit 1 for a bad descending step
+        bad_bits = bad_steps[0].view(np.uint8) | (bad_steps[1].view(np.uint8) << 1)
+        checked |= np.bitwise_or.reduceat(bad_bits, report_starts) != 3
+        return safe
+    lengths = np.diff(report_starts, append=len(levels))
+    # Joining the neighbours of each level other than the first and last of a report
+    joined = steps[:-2] + steps[1:-1]
+    can_join = not_last[:-2] & not_last[1:-1]
+    for direction, bad in zip((1, -1), bad_steps):
+        bad_counts = np.add.reduceat(bad, report_starts, dtype=np.intp)
+        checked |= bad_counts == 0
+        # Bad steps either side of each level, and whether joining its neighbours is bad
+        remaining = np.repeat(bad_counts, lengths) - bad
+        remaining[1:] -= bad[:-1]
+        joined_moves = joined * direction
+        remaining[1:-1] += ((joined_moves < min_step) | (joined_moves > max_step)) & can_join
+        checked |= np.logical_or.reduceat(remaining == 0, report_starts)
+    # Reports of two levels or fewer are always safe after one removal
+    checked |= lengths <= 2
+    return safe
+
+def count_safe_batches(blocks, removals:int = 0, min_step:int = MIN_STEP,
+                       max_step:int = MAX_STEP) -> int:
+    """
+    Counts the safe reports in blocks of report lines, a block at a time with numpy.
+
+    Args:
+        blocks (iterable): Blocks of whole report lines as bytes.
+        removals (int): The most levels that may be removed, 0 or 1.
+        min_step (int): The smallest allowed difference between neighbours.
+        max_step (int): The largest allowed difference between neighbours.
+
+    Returns:
+        int: The count of reports that are considered safe.
+    """
+    safety_count = 0
+    for block in blocks:
+        safe = find_safe_reports(*parse_reports(block), removals, min_step, max_step)
+        safety_count += int(safe.sum())
+    return safety_count
+
+def count_safe_reports(file_name:str, removals:int = 0, use_numpy:bool = None) -> int:
+    """
+    Counts the safe reports in a file, in batches with numpy or a report at a time.
+
+    Args:
+        file_name (str): Name of the input file.
+        removals (int): The most levels that may be removed.
+        use_numpy (bool): None uses numpy for large or streamed inputs if it
+            is installed, True insists on numpy and False never uses it.
+
+    Returns:
+        int: The count of reports that are considered safe.
+    """
+    data = open_input(file_name, os.path.dirname(__file__))
+    if use_numpy is None:
+        use_numpy = (data.streamed or len(data) >= NUMPY_MIN_BYTES) and removals <= 1
+        if use_numpy:
+            try:
+                import numpy   # pylint: disable=import-outside-toplevel,unused-import
+            except ImportError:
+                use_numpy = False
+    if use_numpy:
+        return count_safe_batches(data.blocks(BATCH_BYTES), removals)
+    safety_count = 0
+    for report in data.lines():
+        if is_safe_levels(get_levels(report), removals):
+            safety_count += 1
     return safety_count
 
 def is_safe(report) -> bool:
@@ -62,50 +321,27 @@ def is_safe(report) -> bool:
     is either strictly ascending or descending with each step differing by 1 to 3 units.
 
     Args:
-        report (str): A string containing space-separated level values.
+        report (str or bytes): A line containing space-separated level values.
 
     Returns:
         bool: True if the levels are safe, False otherwise.
     """
-    levels =  [int(n) for n in report.split()]
-    ascending = True
-    if levels[0] > levels[1]:
-        ascending = False
-    for i in range(0, len(levels)-1):
-        if ascending:
-            if not levels[i+1] - levels[i] in range(1,4):
-                return False
-        else:
-            if not levels[i] - levels[i+1] in range(1,4):
-                return False
-    return True
+    return is_safe_levels(get_levels(report))
 
-def is_safe_with_dampener(report) -> bool:
+def is_safe_with_dampener(report, removals:int = DAMPENER_REMOVALS) -> bool:
     """
-    Determines if the levels in the report are safe, allowing for one level to be removed.
-    This function first checks if the levels in the report are safe using the is_safe
-    function.
-    If not, it attempts to remove each level one by one and checks again if the remaining levels
-    are safe. The levels are considered safe if they are strictly ascending or descending with
-    each step differing by 1 to 3 units.
+    Determines if the levels in the report are safe, allowing for levels to be removed.
 
     Args:
-    report (str): A string containing space-separated level values.
+    report (str or bytes): A line containing space-separated level values.
+    removals (int): The most levels that may be removed, one by default.
 
     Returns:
-    bool: True if the levels are safe or can be made safe by removing one level, False otherwise.
+    bool: True if the levels are safe or can be made safe by removing at most
+    `removals` levels, False otherwise.
 
     """
-    if is_safe(report):
-        return True
-    levels =  [int(n) for n in report.split()]
-    for i in range(0, len(levels)):
-        levels_clone = [int(n) for n in report.split()]
-        del levels_clone[i]
-        changed_report = ' '.join(str(item) for item in levels_clone)
-        if is_safe(changed_report):
-            return True
-    return False
+    return is_safe_levels(get_levels(report), removals)
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -116,6 +352,14 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return count_safe_reports(file_name)
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return count_safe_reports(file_name, DAMPENER_REMOVALS)
+
 def main():
     """ Main function
         Reads the specified input file
@@ -124,9 +368,8 @@ def main():
         Once with the rules for the second part 
     """
     file_name = get_file_name()
-    reports = read_input(file_name)
-    print(count_safe(reports,True))
-    print(count_safe(reports,False))
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
@@ -2,25 +2,148 @@
 Day 3 of Advent of Code 2024
 https://adventofcode.com/2024/day/3
 """
+import operator
 import os
 import re
 import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
+SCAN_CHUNK_SIZE = 1 << 20
+# Mapped inputs at least this big are scanned in parallel
+PARALLEL_MIN_BYTES = 64 << 20
+# Ranges handed to each worker, so a slow range does not hold up the rest
+RANGES_PER_JOB = 4
+# python 03day/main.py FILE --throughput times the scanner as instruction kinds are added
+THROUGHPUT_FLAG = "--throughput"
+THROUGHPUT_REPEAT = 3
+MEGABYTE = 1 << 20
+
+class Instruction:
+    """
+    One kind of instruction that can be found in corrupted memory.
+
+    An instruction either computes a value from its integer operands, which
+    is added to the totals, or is a toggle that enables or disables the
+    instructions that follow it.
+
+    Attributes:
+        name (str): The name of the instruction.
+        pattern (bytes): A regular expression matching the whole instruction,
+            with one plain capturing group for each operand.
+        max_length (int): The longest text the pattern can match.
+        operation (function): Computes the value from the operands, None for a toggle.
+        enables (bool): Whether a toggle enables the instructions after it, None
+            for an instruction with an operation.
+        arity (int): The number of operands.
+    """
+    def __init__(self, name:str, pattern:bytes, max_length:int, operation = None,
+                 enables:bool = None) -> None:
+        if (operation is None) == (enables is None):
+            raise ValueError(f"Instruction {name} needs either an operation or a toggle state")
+        self.name = name
+        self.pattern = pattern
+        self.max_length = max_length
+        self.operation = operation
+        self.enables = enables
+        self.arity = re.compile(pattern).groups
+
+class InstructionSet:
+    """
+    A registry of instructions compiled into one matcher over bytes.
+
+    Each registered pattern becomes one alternative of a single regular
+    expression, so one pass over the memory finds every kind of
+    instruction in order however many are registered. The outer group of
+    the alternative that matched identifies the instruction.
+
+    Splitting memory into chunks or ranges relies on no instruction
+    containing the start of another, which holds for the puzzle's set.
+
+    Attributes:
+        max_length (int): The longest text any instruction can match.
+    """
+    def __init__(self, instructions = ()) -> None:
+        self._instructions = {}
+        self._compiled = None
+        for instruction in instructions:
+            self.register(instruction)
+
+    def register(self, instruction:Instruction) -> None:
+        """
+        Adds an instruction to the set.
+
+        Raises:
+            ValueError: If an instruction with the same name is registered.
+        """
+        if instruction.name in self._instructions:
+            raise ValueError(f"Instruction {instruction.name} is already registered")
+        self._instructions[instruction.name] = instruction
+        self._compiled = None
+
+    def __getitem__(self, name:str) -> Instruction:
+        return self._instructions[name]
+
+    def __len__(self) -> int:
+        return len(self._instructions)
+
+    def __iter__(self):
+        return iter(self._instructions.values())
+
+    @property
+    def max_length(self) -> int:
+        """ The longest text any instruction can match"""
+        return max((instruction.max_length for instruction in self), default=1)
+
+    def compile(self) -> tuple:
+        """
+        Builds the combined matcher, once after each change to the set.
+
+        Returns:
+            tuple: The compiled pattern, and a list that maps the index of
+            each alternative's outer group (match.lastindex) to the
+            instruction's operation, operand group indices and toggle state.
+        """
+        if self._compiled is None:
+            alternatives = []
+            kinds = [None]
+            for instruction in self:
+                alternatives.append(b"(" + instruction.pattern + b")")
+                first = len(kinds) + 1
+                kinds.append((instruction.operation,
+                              tuple(range(first, first + instruction.arity)),
+                              instruction.enables))
+                kinds.extend([None] * instruction.arity)
+            self._compiled = (re.compile(b"|".join(alternatives)), kinds)
+        return self._compiled
+
+INSTRUCTIONS = InstructionSet((
+    Instruction("mul", rb"mul\((\d{1,3}),(\d{1,3})\)", len(b"mul(999,999)"), operator.mul),
+    Instruction("do", rb"do\(\)", len(b"do()"), enables=True),
+    Instruction("don't", rb"don't\(\)", len(b"don't()"), enables=False),
+))
+# Further kinds registered one at a time by the throughput benchmark
+EXTRA_INSTRUCTIONS = (
+    Instruction("add", rb"add\((\d{1,3}),(\d{1,3})\)", len(b"add(999,999)"), operator.add),
+    Instruction("sub", rb"sub\((\d{1,3}),(\d{1,3})\)", len(b"sub(999,999)"), operator.sub),
+    Instruction("neg", rb"neg\((\d{1,3})\)", len(b"neg(999)"), operator.neg),
+    Instruction("max", rb"max\((\d{1,3}),(\d{1,3}),(\d{1,3})\)", len(b"max(999,999,999)"), max),
+)
 
 def read_input(file_name:str) -> str:
     """Read input file
 
     Args:
         file_name (str): Name of the input file
-        File is in same location as the python code
+        File is in same location as the python code, or "-" for stdin
         
     Returns:
         A string with the contents of the file
     """
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        return input_data.read()
+    return open_input(file_name, os.path.dirname(__file__)).text()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -48,11 +171,7 @@ def remove_disabled_code(memory:str) -> str:
         str: A string containing only the enabled code segments.
     """    
     blocks = memory.split("do()")
-    enabled_code = ''
-    for block in blocks:
-        sub_blocks = block.split("don't()")
-        enabled_code += sub_blocks[0]
-    return enabled_code
+    return "".join(block.split("don't()", 1)[0] for block in blocks)
 
 def find_valid_instructions(memory: str) -> list:
     """
@@ -68,7 +187,7 @@ def find_valid_instructions(memory: str) -> list:
     Returns:
         list: A list of tuples, each containing a pair of numbers. 
     """
-    matches = re.findall(r"mul\((\d{1,3}),(\d{1,3})\)",memory)
+    matches = re.findall(INSTRUCTIONS["mul"].pattern.decode(), memory)
     return  [(int(x), int(y)) for x, y in matches]
 
 def process_instructions(pairs: list) -> int:
@@ -76,32 +195,238 @@ def process_instructions(pairs: list) -> int:
     Processes a list of number pairs by multiplying each pair and summing the results.
 
     Args:
-        pairs (list): A list of tuples, where each contains two numeric strings.
+        pairs (list): A list of tuples, where each contains two integers.
 
     Returns:
         int: The sum of the products of each pair of numbers.
     """
     count = 0
-    for numbers in pairs:
-        count += int(numbers[0]) * int(numbers[1])
+    for x, y in pairs:
+        count += x * y
     return count
 
+def scan_memory(chunks, instructions:InstructionSet = INSTRUCTIONS) -> tuple:
+    """
+    Sums the instructions in corrupted memory in a single pass.
+
+    The memory is read a chunk at a time and the do() / don't() state is
+    tracked as the tokens are met, so memory use does not depend on the
+    size of the input. The last few bytes of each chunk are carried into
+    the next, so tokens that cross a chunk boundary are still found, and a
+    token is only counted from the chunk where it starts.
+
+    Args:
+        chunks (iterable): The memory as consecutive chunks of bytes.
+        instructions (InstructionSet): The instructions to look for.
+
+    Returns:
+        tuple: The sum of every instruction's value, and the sum of those
+        that are enabled.
+    """
+    pattern, kinds = instructions.compile()
+    max_length = instructions.max_length
+    total = 0
+    enabled_total = 0
+    enabled = True
+    carry = b""
+    chunks = iter(chunks)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        buffer = carry + chunk
+        chunk = next(chunks, None)
+        # A token starting this close to the end may be cut short, leave it for the next chunk
+        limit = len(buffer) if chunk is None else len(buffer) - max_length + 1
+        resume = max(limit, 0)
+        for match in pattern.finditer(buffer):
+            if match.start() >= limit:
+                break
+            resume = max(resume, match.end())
+            operation, operands, enables = kinds[match.lastindex]
+            if operation is None:
+                enabled = enables
+                continue
+            value = operation(*[int(match[group]) for group in operands])
+            total += value
+            if enabled:
+                enabled_total += value
+        carry = buffer[resume:]
+    return total, enabled_total
+
+def scan_range(memory, start:int, end:int,
+               instructions:InstructionSet = INSTRUCTIONS) -> tuple:
+    """
+    Sums the instructions that start in one range of memory.
+
+    The enable state at the start of the range is not known, so the enabled
+    sum is given both ways. A token starting in the range may run up to
+    max_length - 1 bytes past its end; no token contains the start of
+    another, so scanning from the start of the range finds no false tokens.
+
+    Args:
+        memory: The whole memory, bytes or an mmap.
+        start (int): Offset of the first byte of the range.
+        end (int): Offset just past the last byte of the range.
+        instructions (InstructionSet): The instructions to look for.
+
+    Returns:
+        tuple: The sum of every value, the enabled sum if the range starts
+        enabled, the enabled sum if it starts disabled, and the first and
+        last toggle in the range (True for do(), False for don't(), None if
+        there is none).
+    """
+    pattern, kinds = instructions.compile()
+    total = 0
+    before_toggle = 0
+    after_toggle = 0
+    first_toggle = None
+    enabled = None
+    endpos = min(end + instructions.max_length - 1, len(memory))
+    for match in pattern.finditer(memory, start, endpos):
+        if match.start() >= end:
+            break
+        operation, operands, enables = kinds[match.lastindex]
+        if operation is None:
+            enabled = enables
+            if first_toggle is None:
+                first_toggle = enabled
+            continue
+        value = operation(*[int(match[group]) for group in operands])
+        total += value
+        if enabled is None:
+            before_toggle += value
+        elif enabled:
+            after_toggle += value
+    return total, before_toggle + after_toggle, after_toggle, first_toggle, enabled
+
+def scan_file_range(path:str, start:int, end:int,
+                    instructions:InstructionSet = INSTRUCTIONS) -> tuple:
+    """ Maps a file and scans one range of it, see scan_range; run in a worker process"""
+    return scan_range(open_input(path).bytes, start, end, instructions)
+
+def combine_scans(scans) -> tuple:
+    """
+    Stitches the results of scan_range for consecutive ranges together.
+
+    Memory starts enabled, and each range hands the state left by its last
+    toggle to the next range.
+
+    Args:
+        scans (iterable): scan_range results in the order of their ranges.
+
+    Returns:
+        tuple: The sum of every mul instruction, and the sum of those that
+        are enabled.
+    """
+    total = 0
+    enabled_total = 0
+    enabled = True
+    for range_total, if_enabled, if_disabled, _, last_toggle in scans:
+        total += range_total
+        enabled_total += if_enabled if enabled else if_disabled
+        if last_toggle is not None:
+            enabled = last_toggle
+    return total, enabled_total
+
+def scan_parallel(path:str, size:int, jobs:int,
+                  instructions:InstructionSet = INSTRUCTIONS) -> tuple:
+    """
+    Scans a file in ranges across a pool of worker processes.
+
+    Each worker maps the file itself, so only offsets and sums are passed
+    between processes.
+
+    Args:
+        path (str): Path of an uncompressed input file.
+        size (int): The size of the file in bytes.
+        jobs (int): The number of worker processes.
+        instructions (InstructionSet): The instructions to look for.
+
+    Returns:
+        tuple: The sum of every instruction's value, and the sum of those
+        that are enabled.
+    """
+    count = max(1, min(jobs * RANGES_PER_JOB, size // instructions.max_length))
+    bounds = [size * index // count for index in range(count + 1)]
+    from aoc import parallel   # pylint: disable=import-outside-toplevel
+    with parallel.create_pool(sys.modules[__name__], jobs) as pool:
+        return combine_scans(pool.map(scan_file_range, [path] * count,
+                                      bounds[:-1], bounds[1:], [instructions] * count))
+
+def scan_file(file_name:str, chunk_size:int = SCAN_CHUNK_SIZE, jobs:int = None,
+              instructions:InstructionSet = INSTRUCTIONS) -> tuple:
+    """
+    Returns the sums of all and of enabled instructions in a file.
+
+    Args:
+        file_name (str): Name of the input file.
+        chunk_size (int): Bytes read at a time by the sequential scan.
+        jobs (int): Worker processes for a parallel scan, 1 scans here.
+            None uses every CPU for mapped inputs of PARALLEL_MIN_BYTES or more.
+        instructions (InstructionSet): The instructions to look for.
+
+    Returns:
+        tuple: The sum of every instruction's value, and the sum of those
+        that are enabled.
+    """
+    data = open_input(file_name, os.path.dirname(__file__))
+    if data.streamed:
+        jobs = 1
+    elif jobs is None:
+        jobs = (os.cpu_count() or 1) if len(data) >= PARALLEL_MIN_BYTES else 1
+    if jobs > 1:
+        return scan_parallel(os.path.abspath(data.path), len(data), jobs, instructions)
+    return scan_memory(data.chunks(chunk_size), instructions)
+
+def measure_throughput(memory:bytes, repeat:int = THROUGHPUT_REPEAT) -> list:
+    """
+    Times the scanner as each of EXTRA_INSTRUCTIONS is registered in turn.
+
+    Args:
+        memory (bytes): The memory to scan.
+        repeat (int): Scans timed for each instruction set, the fastest is kept.
+
+    Returns:
+        list: (number of instruction kinds, megabytes scanned per second) for
+        the puzzle's set and for each larger set.
+    """
+    instructions = InstructionSet(INSTRUCTIONS)
+    throughput = []
+    for extra in (None,) + EXTRA_INSTRUCTIONS:
+        if extra is not None:
+            instructions.register(extra)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scan_memory((memory,), instructions)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        throughput.append((len(instructions), len(memory) / MEGABYTE / max(best, 1e-9)))
+    return throughput
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return scan_file(file_name)[0]
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return scan_file(file_name)[1]
+
 def main():
     """ Main function
-        Reads the specified input file
-        Sums the valid instructions for Part 1
-        Sums the valid instructions for Part 2
+        Scans the specified input file once
+        Prints the sum of the valid instructions for Part 1
+        Prints the sum of the enabled instructions for Part 2
+        With --throughput, prints MB/s as instruction kinds are added instead
     """
     file_name = get_file_name()
-    memory = read_input(file_name)
-    valid_instructions = find_valid_instructions(memory)
-    total = process_instructions(valid_instructions)
-    print(total)
-    # Part 2
-    executable_code = remove_disabled_code(memory)
-    valid_instructions = find_valid_instructions(executable_code)   
-    total_2 = process_instructions(valid_instructions)
-    print(total_2)
+    if THROUGHPUT_FLAG in sys.argv[2:]:
+        memory = open_input(file_name, os.path.dirname(__file__)).bytes[:]
+        for kinds, megabytes_per_second in measure_throughput(memory):
+            print(f"{kinds} kinds: {megabytes_per_second:.1f} MB/s")
+        return
+    for total in scan_file(file_name):
+        print(total)
 
 
 if __name__ == "__main__":
@@ -4,17 +4,35 @@ https://adventofcode.com/2024/day/4
 """
 import os
 import sys
+from collections import deque
 from itertools import product
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
+
 DEFAULT_FILE_NAME = "input.txt"
-WORD = 'XMAS'
+# The grid holds byte values, so letters are compared as bytes
+WORD = b'XMAS'
 WORD_LEN = len(WORD)
-FIRST_LETTER = "X"
-FIRST_CROSS = "M"
-LAST_CROSS = "S"
-CENTER_CROSS = "A"
+FIRST_LETTER = ord("X")
+FIRST_CROSS = ord("M")
+LAST_CROSS = ord("S")
+CENTER_CROSS = ord("A")
+# Every direction a word can be read in, as (vertical, horizontal) steps
+DIRECTIONS = tuple(step for step in product((-1, 0, 1), repeat=2) if step != (0, 0))
+# Directions of the lines that cover the grid; each line is also read backwards
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+ALPHABET_SIZE = 256
+# Inputs of at least this many bytes are searched with numpy, when it is installed
+NUMPY_MIN_BYTES = 1 << 18
+# numpy searches bands of rows holding about this many cells, to bound memory use
+BAND_CELLS = 1 << 22
+# Mapped inputs at least this big have their bands searched in parallel
+PARALLEL_MIN_BYTES = 1 << 28
+# Stencil rows use this character for cells that match anything
+WILDCARD = "."
 
-def read_input(file_name:str) -> list:
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -22,14 +40,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A grid view of the mapped file, indexed as grid[y][x]
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line.strip())
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).grid()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -40,25 +53,6 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
-def create_matrix(file_data) -> list:
-    """
-    Converts a list of strings into a matrix (list of lists), where each string
-    is split into a list of its characters.
-
-    Args:
-        file_data (list of str): A list of strings to be converted into a matrix.
-
-    Returns:
-        list: A matrix representation of the input data, with each string
-        converted into a list of characters.
-    """
-    matrix =[None] * len(file_data) 
-    index = -1
-    for line in file_data:
-        index += 1
-        matrix[index] = list(line)
-    return matrix
-
 def process_puzzle(puzzle:list ,row_count:int ,column_count:int ) -> int:
     """
     Processes a puzzle grid to count the number of words found.
@@ -69,7 +63,7 @@ def process_puzzle(puzzle:list ,row_count:int ,column_count:int ) -> int:
     from that position in various directions.
 
     Args:
-        puzzle (list of list of str): The puzzle grid represented as a 2D list.
+        puzzle (Grid): The puzzle grid represented as a 2D list.
         row_count (int): The number of rows in the puzzle grid.
         column_count (int): The number of columns in the puzzle grid.
 
@@ -89,7 +83,7 @@ def words_found(puzzle:list , y:int,x:int, row_count:int ,column_count:int ) ->
     from a given starting position in a 2D puzzle grid.
 
     Args:
-        puzzle (list of list of str): The 2D grid representing the puzzle.
+        puzzle (Grid): The 2D grid representing the puzzle.
         y (int): The starting row index in the puzzle.
         x (int): The starting column index in the puzzle.
         row_count (int): The total number of rows in the puzzle.
@@ -99,9 +93,7 @@ def words_found(puzzle:list , y:int,x:int, row_count:int ,column_count:int ) ->
         int: The number of times the word is found starting from the given position.
     """
     count = 0
-    directions = list(product([-1,0,1],[-1,0,1] ))
-    directions.remove((0,0))
-    for vertical_direction, horizontal_direction in directions:
+    for vertical_direction, horizontal_direction in DIRECTIONS:
         if 0 <= y + vertical_direction * (WORD_LEN-1) < row_count:
             if 0 <= x + horizontal_direction * (WORD_LEN-1) < column_count:
                 if is_word_found(puzzle,y,x,vertical_direction,horizontal_direction):
@@ -115,7 +107,7 @@ def is_word_found(puzzle:list , start_y:int ,start_x:int,
     from a specified position and moving in a specified direction.
 
     Args:
-        puzzle (list of list of str): The 2D grid of characters to search within.
+        puzzle (Grid): The 2D grid of characters to search within.
         start_y (int): The starting row index in the puzzle.
         start_x (int): The starting column index in the puzzle.
         vertical_direction (int): The vertical movement direction (1 for down, -1 for up).
@@ -124,16 +116,307 @@ def is_word_found(puzzle:list , start_y:int ,start_x:int,
     Returns:
         bool: True if the word 'XMAS' is found in the specified direction, False otherwise.
     """
-    word_len = len(WORD)
-    char_list = []
     y = start_y
     x = start_x
-    for _ in range (0,word_len):
-        char_list.append(puzzle[y][x])
+    for letter in WORD:
+        if puzzle[y][x] != letter:
+            return False
         y += vertical_direction
         x += horizontal_direction
-    return ''.join(char_list) == WORD
+    return True
           
+class WordSearch:
+    """
+    An Aho-Corasick automaton that finds a set of words in lines of text.
+
+    Each word is added forwards and backwards, so reading a line once finds
+    the words in both directions along it. Transitions are stored as a
+    full table per state, so each byte of a line costs one list lookup
+    whatever the number of words.
+
+    Attributes:
+        words (tuple): The words searched for, as bytes.
+    """
+    def __init__(self, words) -> None:
+        self.words = tuple(words)
+        children = [{}]
+        self._outputs = [[]]
+        for index, word in enumerate(self.words):
+            for backwards, pattern in ((False, word), (True, word[::-1])):
+                state = 0
+                for letter in pattern:
+                    if letter not in children[state]:
+                        children[state][letter] = len(children)
+                        children.append({})
+                        self._outputs.append([])
+                    state = children[state][letter]
+                self._outputs[state].append((index, backwards))
+        # Breadth first, so a state's fallback is complete before the state is
+        fallback = [0] * len(children)
+        self._table = [None] * len(children)
+        self._table[0] = [children[0].get(letter, 0) for letter in range(ALPHABET_SIZE)]
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            self._outputs[state] = self._outputs[state] + self._outputs[fallback[state]]
+            row = list(self._table[fallback[state]])
+            for letter, child in children[state].items():
+                fallback[child] = self._table[fallback[state]][letter]
+                row[letter] = child
+                queue.append(child)
+            self._table[state] = row
+
+    def find(self, line:bytes):
+        """
+        Lazily yields every word found in a line.
+
+        Yields:
+            tuple: The index in the line of the last letter matched, the
+            index of the word in words and True if it was read backwards.
+        """
+        table = self._table
+        outputs = self._outputs
+        state = 0
+        for position, letter in enumerate(line):
+            state = table[state][letter]
+            for word_index, backwards in outputs[state]:
+                yield position, word_index, backwards
+
+    def count(self, line:bytes, counts:list) -> None:
+        """ Adds the number of times each word is found in a line to counts"""
+        table = self._table
+        outputs = self._outputs
+        state = 0
+        for letter in line:
+            state = table[state][letter]
+            for word_index, _ in outputs[state]:
+                counts[word_index] += 1
+
+def get_grid_lines(puzzle):
+    """
+    Lazily yields every row, column, diagonal and anti-diagonal of a grid.
+
+    Reading each line forwards and backwards covers all eight directions.
+
+    Yields:
+        tuple: The row and column of the first cell, the (vertical,
+        horizontal) step along the line, and the line as bytes.
+    """
+    for step_y, step_x in LINE_DIRECTIONS:
+        starts = set()
+        if step_y == 0:
+            starts.update((y, 0) for y in range(puzzle.rows))
+        else:
+            starts.update((0, x) for x in range(puzzle.cols))
+            if step_x == 1:
+                starts.update((y, 0) for y in range(1, puzzle.rows))
+            elif step_x == -1:
+                starts.update((y, puzzle.cols - 1) for y in range(1, puzzle.rows))
+        for y, x in sorted(starts):
+            yield y, x, step_y, step_x, puzzle.line(y, x, step_y, step_x)
+
+def search_words(puzzle, words, positions:bool = False) -> dict:
+    """
+    Finds words in a grid, read in any of the eight directions.
+
+    Every line of the grid is read once by a single automaton for all the
+    words, so the cost grows with the size of the grid and the number of
+    matches rather than with the number of words or directions.
+
+    Args:
+        puzzle (Grid): The grid to search.
+        words (iterable): The words to find, as bytes.
+        positions (bool): Return where each word was found rather than counts.
+
+    Returns:
+        dict: Maps each word to the number of times it was found, or if
+        positions is set to a list of (y, x, vertical, horizontal) giving
+        its first letter and the direction it is read in.
+    """
+    search = WordSearch(words)
+    if not positions:
+        counts = [0] * len(search.words)
+        for _, _, _, _, line in get_grid_lines(puzzle):
+            search.count(line, counts)
+        return dict(zip(search.words, counts))
+    found = {word: [] for word in search.words}
+    for y, x, step_y, step_x, line in get_grid_lines(puzzle):
+        for position, word_index, backwards in search.find(line):
+            word = search.words[word_index]
+            if backwards:
+                start = position
+                direction = (-step_y, -step_x)
+            else:
+                start = position - len(word) + 1
+                direction = (step_y, step_x)
+            found[word].append((y + step_y * start, x + step_x * start) + direction)
+    return found
+
+class Stencil:
+    """
+    A shape of cells to match at every position of a grid.
+
+    Cells left out of the stencil are wildcards and match anything.
+
+    Attributes:
+        cells (tuple): (dy, dx, value) for each cell that must match, with
+            offsets from the top left corner of the stencil.
+        height (int): The number of rows the stencil covers.
+        width (int): The number of columns the stencil covers.
+    """
+    def __init__(self, cells) -> None:
+        cells = list(cells)
+        top = min(dy for dy, _, _ in cells)
+        left = min(dx for _, dx, _ in cells)
+        self.cells = tuple(sorted((dy - top, dx - left, value) for dy, dx, value in cells))
+        self.height = max(dy for dy, _, _ in self.cells) + 1
+        self.width = max(dx for _, dx, _ in self.cells) + 1
+
+    @classmethod
+    def from_rows(cls, rows, wildcard:str = WILDCARD):
+        """ Builds a stencil from rows of text, e.g. ("M.S", ".A.", "M.S")"""
+        return cls((y, x, ord(letter)) for y, row in enumerate(rows)
+                   for x, letter in enumerate(row) if letter != wildcard)
+
+    @classmethod
+    def from_word(cls, word:bytes, step_y:int, step_x:int):
+        """ Builds a stencil that reads a word in one direction"""
+        return cls((index * step_y, index * step_x, letter) for index, letter in enumerate(word))
+
+    def rotated(self):
+        """ Returns the stencil turned a quarter turn clockwise"""
+        return Stencil((dx, -dy, value) for dy, dx, value in self.cells)
+
+    def orientations(self) -> list:
+        """ Returns the stencil at each quarter turn, leaving out turns that look the same"""
+        found = []
+        stencil = self
+        for _ in range(4):
+            if all(stencil.cells != other.cells for other in found):
+                found.append(stencil)
+            stencil = stencil.rotated()
+        return found
+
+# XMAS read in all eight directions, and the four ways round of the X-MAS cross
+XMAS_STENCILS = (Stencil.from_word(WORD, 0, 1).orientations()
+                 + Stencil.from_word(WORD, 1, 1).orientations())
+CROSS_STENCILS = Stencil.from_rows(("M.S", ".A.", "M.S")).orientations()
+
+def count_stencils(cells, stencils) -> int:
+    """
+    Counts the positions where each stencil matches, for every position at once.
+
+    Each stencil cell compares a shifted slice of the grid with its value,
+    and the masks are combined, so no Python code runs per grid cell.
+
+    Args:
+        cells (numpy.ndarray): The grid as a 2D array of byte values, see Grid.array.
+        stencils (iterable): The stencils to match.
+
+    Returns:
+        int: The total number of matches of all the stencils.
+    """
+    import numpy as np   # pylint: disable=import-outside-toplevel
+    rows, cols = cells.shape
+    count = 0
+    for stencil in stencils:
+        match_rows = rows - stencil.height + 1
+        match_cols = cols - stencil.width + 1
+        if match_rows <= 0 or match_cols <= 0:
+            continue
+        matches = np.ones((match_rows, match_cols), dtype=bool)
+        for dy, dx, value in stencil.cells:
+            matches &= cells[dy:dy + match_rows, dx:dx + match_cols] == value
+        count += int(np.count_nonzero(matches))
+    return count
+
+def count_band(buffer, layout:tuple, stencils, top:int, bottom:int) -> int:
+    """
+    Counts the stencil matches whose top row is in one band of rows.
+
+    The band is viewed together with a halo of the rows below it that the
+    tallest stencil can reach, so matches crossing into the next band are
+    found. Only matches starting in the band are counted, so each match is
+    counted by exactly one band.
+
+    Args:
+        buffer: The whole input, bytes or an mmap.
+        layout (tuple): The columns, stride and rows, see InputFile.grid_layout.
+        stencils (list): The stencils to match.
+        top (int): The first row of the band.
+        bottom (int): The row just past the band.
+
+    Returns:
+        int: The number of matches starting in the band.
+    """
+    import numpy as np   # pylint: disable=import-outside-toplevel
+    cols, stride, rows = layout
+    last = min(bottom + max(stencil.height for stencil in stencils) - 1, rows)
+    if last <= top or cols == 0:
+        return 0
+    band = np.frombuffer(buffer, dtype=np.uint8, count=(last - top - 1) * stride + cols,
+                         offset=top * stride)
+    cells = np.lib.stride_tricks.as_strided(band, (last - top, cols), (stride, 1),
+                                            writeable=False)
+    count = 0
+    for stencil in stencils:
+        anchors = min(bottom, rows - stencil.height + 1) - top
+        if anchors > 0:
+            count += count_stencils(cells[:anchors + stencil.height - 1], (stencil,))
+    return count
+
+def count_file_band(path:str, layout:tuple, stencils, top:int, bottom:int) -> int:
+    """ Maps a file and counts the matches in one band of it, see count_band; run in a worker"""
+    return count_band(open_input(path).bytes, layout, stencils, top, bottom)
+
+def count_stencils_tiled(data, stencils, band_cells:int = BAND_CELLS, jobs:int = None) -> int:
+    """
+    Counts stencil matches in a grid a band of rows at a time.
+
+    The grid is never loaded whole: each band is a view of the mapped file,
+    and only the masks for one band are allocated, so peak memory grows
+    with the band size and the width of the grid but not its height. In
+    parallel, each worker maps the file itself.
+
+    Args:
+        data (InputFile): The input holding the grid.
+        stencils (list): The stencils to match.
+        band_cells (int): Roughly how many cells each band holds.
+        jobs (int): Worker processes to search bands in parallel, 1 searches
+            here. None uses every CPU for mapped inputs of PARALLEL_MIN_BYTES
+            or more.
+
+    Returns:
+        int: The total number of matches of all the stencils.
+    """
+    layout = data.grid_layout()
+    cols, _, rows = layout
+    band_rows = max(1, band_cells // max(cols, 1))
+    tops = range(0, rows, band_rows)
+    bottoms = [min(top + band_rows, rows) for top in tops]
+    if data.streamed:
+        jobs = 1
+    elif jobs is None:
+        jobs = (os.cpu_count() or 1) if len(data) >= PARALLEL_MIN_BYTES else 1
+    if jobs <= 1:
+        return sum(count_band(data.bytes, layout, stencils, top, bottom)
+                   for top, bottom in zip(tops, bottoms))
+    count = len(tops)
+    from aoc import parallel   # pylint: disable=import-outside-toplevel
+    with parallel.create_pool(sys.modules[__name__], jobs) as pool:
+        return sum(pool.map(count_file_band, [os.path.abspath(data.path)] * count,
+                            [layout] * count, [stencils] * count, tops, bottoms))
+
+def use_numpy(data) -> bool:
+    """ Returns True if the input is big enough to search with numpy and numpy is installed"""
+    if len(data) < NUMPY_MIN_BYTES:
+        return False
+    try:
+        import numpy   # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
 def process_puzzle_part_2(puzzle:list , row_count:int, column_count:int) -> int:
     """
     Processes the puzzle to count occurrences of a specific pattern.
@@ -143,7 +426,7 @@ def process_puzzle_part_2(puzzle:list , row_count:int, column_count:int) -> int:
     Counts and returns the number of such patterns found.
 
     Args:
-        puzzle (list of list of str): The puzzle grid to be processed.
+        puzzle (Grid): The puzzle grid to be processed.
         row_count (int): The number of rows in the puzzle.
         column_count (int): The number of columns in the puzzle.
 
@@ -168,7 +451,7 @@ def cross_found(puzzle,y,x) -> bool:
     returns False.
 
     Args:
-        puzzle (list of list of str): A 2D list representing the puzzle grid.
+        puzzle (Grid): A 2D list representing the puzzle grid.
         y (int): The y-coordinate (row index) in the puzzle.
         x (int): The x-coordinate (column index) in the puzzle.
 
@@ -185,7 +468,22 @@ def cross_found(puzzle,y,x) -> bool:
     if puzzle[y-1][x+1] == LAST_CROSS and puzzle[y+1][x-1] == FIRST_CROSS:
         count += 1
     return count == 2
-    
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    data = open_input(file_name, os.path.dirname(__file__))
+    if use_numpy(data):
+        return count_stencils_tiled(data, XMAS_STENCILS)
+    return search_words(data.grid(), (WORD,))[WORD]
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    data = open_input(file_name, os.path.dirname(__file__))
+    if use_numpy(data):
+        return count_stencils_tiled(data, CROSS_STENCILS)
+    puzzle = data.grid()
+    return process_puzzle_part_2(puzzle, puzzle.rows, puzzle.cols)
+
 def main():
     """ Main function
         Reads the specified input file
@@ -193,15 +491,8 @@ def main():
         Prints the result for each part
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    ## PART 1
-    puzzle = create_matrix(file_data)
-    count = process_puzzle(puzzle, len(file_data), len(puzzle[0]))
-    print(count)
-    
-    ## PART 2
-    count = process_puzzle_part_2(puzzle, len(file_data), len(puzzle[0]))
-    print(count)
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
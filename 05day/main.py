@@ -2,30 +2,34 @@
 Day 5 of Advent of Code 2024
 https://adventofcode.com/2024/day/5
 """
+import heapq
 import math
 import os
 import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
+
 DEFAULT_FILE_NAME = "input.txt"
+# Functions instrumented when profiling is enabled (python -m aoc run --profile)
+HOT_FUNCTIONS = ("RuleIndex.is_valid", "RuleIndex.reorder", "RuleIndex.get_middle_page")
 RULE_SEP = '|'
 UPDATE_SEP = ','
+# Inputs with at least this many updates are checked in parallel on every CPU
+PARALLEL_MIN_UPDATES = 50_000
+UPDATES_PER_BATCH = 2000
 
 def read_input(file_name:str) -> list:
     """Read input file
 
     Args:
         file_name (str): Name of the input file
-        File is in same location as the python code
+        File is in same location as the python code, or "-" for stdin
         
     Returns:
         A list of the lines in the file
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).text().splitlines()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -62,6 +66,164 @@ def get_rules(file_data) -> dict:
             rules[pages[1]] = [pages[0]]     
     return rules
 
+class RuleIndex:
+    """
+    The page ordering rules compiled for checks without list scans.
+
+    Each page named in a rule is interned to a small int, and the pages
+    that must come before a page are kept as a bitset: a Python int with
+    bit i set for page i. An update is checked from its last page to its
+    first, keeping a bitset of the pages seen so far, so a page is out of
+    order if its predecessors overlap the pages after it. That is one
+    bitwise and per page.
+
+    Attributes:
+        page_ids (dict): Maps each page named in a rule to its id.
+        predecessors (list): For each page id, the bitset of pages that
+            must precede it.
+    """
+    def __init__(self, page_ordering_rules:dict) -> None:
+        self.page_ids = {}
+        for page, required_pages in page_ordering_rules.items():
+            for named_page in (page, *required_pages):
+                self.page_ids.setdefault(named_page, len(self.page_ids))
+        self.predecessors = [0] * len(self.page_ids)
+        for page, required_pages in page_ordering_rules.items():
+            bits = 0
+            for required_page in required_pages:
+                bits |= 1 << self.page_ids[required_page]
+            self.predecessors[self.page_ids[page]] = bits
+
+    def get_ids(self, update) -> list:
+        """ Returns the ids of the pages in an update, leaving out pages no rule names"""
+        page_ids = self.page_ids
+        return [page_ids[page] for page in update if page in page_ids]
+
+    def must_precede(self, first_id:int, second_id:int) -> bool:
+        """ Returns True if a rule puts the first page before the second"""
+        return bool(self.predecessors[second_id] >> first_id & 1)
+
+    def is_valid(self, update) -> bool:
+        """ Returns True if every page of the update is after the pages that must precede it"""
+        predecessors = self.predecessors
+        later = 0
+        for page_id in reversed(self.get_ids(update)):
+            if predecessors[page_id] & later:
+                return False
+            later |= 1 << page_id
+        return True
+
+    def reorder(self, update) -> list:
+        """
+        Puts the pages of an update into an order that satisfies the rules.
+
+        Kahn's algorithm runs on the rules between the update's pages: a
+        page is ready once every page that must precede it has been placed.
+        Ready pages are taken in their original order, so pages the rules
+        do not constrain keep their relative order. The update is not changed.
+
+        Args:
+            update (list): The pages of the update.
+
+        Returns:
+            list: The pages in rule order.
+
+        Raises:
+            ValueError: If the rules between the pages form a cycle.
+        """
+        ids = [self.page_ids.get(page) for page in update]
+        present = 0
+        for page_id in ids:
+            if page_id is not None:
+                present |= 1 << page_id
+        predecessors = self.predecessors
+        waiting = [0 if page_id is None else (predecessors[page_id] & present).bit_count()
+                   for page_id in ids]
+        ready = [position for position, count in enumerate(waiting) if count == 0]
+        order = []
+        while ready:
+            position = heapq.heappop(ready)
+            order.append(update[position])
+            if ids[position] is None:
+                continue
+            bit = 1 << ids[position]
+            for other, other_id in enumerate(ids):
+                if other_id is not None and predecessors[other_id] & bit:
+                    waiting[other] -= 1
+                    if waiting[other] == 0:
+                        heapq.heappush(ready, other)
+        if len(order) < len(update):
+            cycle = " -> ".join(self.find_cycle(update))
+            raise ValueError(f"The rules for update {UPDATE_SEP.join(update)} form a cycle: {cycle}")
+        return order
+
+    def find_cycle(self, update) -> list:
+        """
+        Finds pages of an update whose rules form a cycle.
+
+        Pages with no predecessor left among the others are removed until
+        none can be; every page that remains has a predecessor that
+        remains, so following predecessors must come back round.
+
+        Args:
+            update (list): The pages of the update.
+
+        Returns:
+            list: The pages of a cycle in rule order, the first page repeated
+            at the end, or an empty list if there is no cycle.
+        """
+        pages = {self.page_ids[page]: page for page in update if page in self.page_ids}
+        predecessors = self.predecessors
+        remaining = 0
+        for page_id in pages:
+            remaining |= 1 << page_id
+        removed = True
+        while removed:
+            removed = False
+            for page_id in pages:
+                if remaining >> page_id & 1 and not predecessors[page_id] & remaining:
+                    remaining &= ~(1 << page_id)
+                    removed = True
+        if not remaining:
+            return []
+        path = []
+        visited = {}
+        page_id = (remaining & -remaining).bit_length() - 1
+        while page_id not in visited:
+            visited[page_id] = len(path)
+            path.append(page_id)
+            candidates = predecessors[page_id] & remaining
+            page_id = (candidates & -candidates).bit_length() - 1
+        cycle = path[visited[page_id]:] + [page_id]
+        return [pages[page_id] for page_id in reversed(cycle)]
+
+    def get_middle_page(self, update):
+        """
+        Returns the middle page of an update once it is in rule order,
+        without sorting it where possible.
+
+        When the rules order every pair of the update's pages, a page's
+        position is the number of the update's pages that must precede it,
+        one bit count per page. If those counts are not a valid order the
+        update is reordered in full with reorder.
+
+        Raises:
+            ValueError: If the rules between the pages form a cycle.
+        """
+        ids = self.get_ids(update)
+        if len(ids) == len(update):
+            present = 0
+            for page_id in ids:
+                present |= 1 << page_id
+            order = [None] * len(update)
+            for page, page_id in zip(update, ids):
+                position = (self.predecessors[page_id] & present).bit_count()
+                if position < len(order):
+                    order[position] = page
+            if None not in order and self.is_valid(order):
+                return order[get_middle_index(order)]
+        return self.reorder(update)[get_middle_index(update)]
+
 def get_updates(file_data) -> list:
     """
     Extracts and returns a list of updates from the provided file data.
@@ -100,7 +262,7 @@ def get_middle_index(array: list) -> int:
     return math.floor(len(array)/2)
 
         
-def get_sum_of_valid_updates(page_updates, page_ordering_rules) -> tuple:
+def get_sum_of_valid_updates(page_updates, page_ordering_rules, jobs:int = None) -> tuple:
     """
     Calculate the sum of valid page updates based on ordering rules.
 
@@ -115,26 +277,91 @@ def get_sum_of_valid_updates(page_updates, page_ordering_rules) -> tuple:
         page_ordering_rules (dict): A dictionary defining the ordering rules for
             pages, where keys are pages and values are lists of required preceding
             pages.
+        jobs (int): Worker processes to check the updates in, 1 checks them here.
+            None uses every CPU if there are PARALLEL_MIN_UPDATES updates or more.
 
     Returns:
         tuple: A tuple containing two integers. The first integer is the sum of
         the middle values of valid updates, and the second integer is the sum of
         the fixed updates.
     """
+    rule_index = RuleIndex(page_ordering_rules)
+    if jobs is None:
+        jobs = (os.cpu_count() or 1) if len(page_updates) >= PARALLEL_MIN_UPDATES else 1
+    if jobs > 1:
+        return sum_updates_parallel(page_updates, rule_index, jobs)
+    return sum_updates(page_updates, rule_index)
+
+def sum_updates(page_updates, rule_index:RuleIndex) -> tuple:
+    """
+    Sums the middle pages of the valid updates, and of the invalid updates
+    once they are reordered, see get_sum_of_valid_updates.
+    """
     count_part_1, count_part_2 = 0,0
     for update in page_updates:
-        middle = get_middle_index(update)
-        valid = True
-        for i,page in enumerate(update):
-            if  is_page_in_wrong_position(page,i, update, page_ordering_rules):
-                valid = False
-        if valid:
-            count_part_1 += int(update[middle])
+        if rule_index.is_valid(update):
+            count_part_1 += int(update[get_middle_index(update)])
         else:
-            count_part_2 += reorder_and_get_middle(update, page_ordering_rules)
-            
+            count_part_2 += int(rule_index.get_middle_page(update))
     return (count_part_1,count_part_2)
 
+# The rule index of a worker process, set once when the worker starts
+_worker_rule_index = None
+
+def share_rule_index(rule_index:RuleIndex) -> None:
+    """ Keeps the rule index for every batch run in this worker process"""
+    global _worker_rule_index   # pylint: disable=global-statement
+    _worker_rule_index = rule_index
+
+def sum_update_batch(batch:str) -> tuple:
+    """ Sums a batch of update lines with the worker's rule index; run in a worker process"""
+    page_updates = [line.split(UPDATE_SEP) for line in batch.splitlines()]
+    return sum_updates(page_updates, _worker_rule_index)
+
+def sum_updates_parallel(page_updates, rule_index:RuleIndex, jobs:int,
+                         batch_size:int = UPDATES_PER_BATCH) -> tuple:
+    """
+    Sums the updates in batches across a pool of worker processes.
+
+    The rule index is built and pickled once, and each worker unpickles it
+    when it starts rather than once per batch. Each batch is sent as one
+    string of update lines, which pickles far faster than lists of page
+    strings, and comes back as two sums.
+
+    Args:
+        page_updates (list): The updates to check.
+        rule_index (RuleIndex): The compiled rules.
+        jobs (int): The number of worker processes.
+        batch_size (int): The number of updates sent to a worker at a time.
+
+    Returns:
+        tuple: The sums for part 1 and part 2, see get_sum_of_valid_updates.
+    """
+    batches = ["\n".join(UPDATE_SEP.join(update) for update in page_updates[start:start + batch_size])
+               for start in range(0, len(page_updates), batch_size)]
+    from aoc import parallel   # pylint: disable=import-outside-toplevel
+    with parallel.create_pool(sys.modules[__name__], jobs, "share_rule_index",
+                              (rule_index,)) as pool:
+        sums = list(pool.map(sum_update_batch, batches))
+    return (sum(count for count, _ in sums), sum(count for _, count in sums))
+
+def is_valid_update(update, page_ordering_rules) -> bool:
+    """
+    Determine if every page in an update satisfies the ordering rules.
+
+    Args:
+        update: A list representing the order of pages in the update.
+        page_ordering_rules: A dictionary where keys are pages and values are lists
+            of pages that must precede the key page.
+
+    Returns:
+        bool: True if no page is in the wrong position, False otherwise.
+    """
+    for i,page in enumerate(update):
+        if is_page_in_wrong_position(page, i, update, page_ordering_rules):
+            return False
+    return True
+
 def is_page_in_wrong_position(page, pos_of_page, update, page_ordering_rules) -> bool:
     """
     Determine if a page is in the wrong position based on ordering rules.
@@ -188,7 +415,7 @@ def reorder_and_get_middle(update, page_ordering_rules):
     Iterates through the update list, checking if each page is in the wrong position
     using the page ordering rules. If a page is misplaced, it is moved to the correct
     position. Finally, the function calculates and returns the middle element of the
-    reordered list.
+    reordered list. The pages are reordered in a copy, so the update is not changed.
 
     Args:
         update (list): The list of pages to be reordered.
@@ -198,6 +425,7 @@ def reorder_and_get_middle(update, page_ordering_rules):
     Returns:
         int: The middle element of the reordered update list.
     """
+    update = list(update)
     i = 0
     while i < len(update):
         page = update[i]
@@ -209,6 +437,21 @@ def reorder_and_get_middle(update, page_ordering_rules):
     middle = get_middle_index(update)
     return int(update[middle])
 
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    file_data = read_input(file_name)
+    rule_index = RuleIndex(get_rules(file_data))
+    count = 0
+    for update in get_updates(file_data):
+        if rule_index.is_valid(update):
+            count += int(update[get_middle_index(update)])
+    return count
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    file_data = read_input(file_name)
+    return get_sum_of_valid_updates(get_updates(file_data), get_rules(file_data))[1]
+
 def main():
     """ Main function
         Reads the specified input file
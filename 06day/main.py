@@ -5,15 +5,19 @@ https://adventofcode.com/2024/day/6
 import os
 import sys
 
-from copy import deepcopy
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
+# Functions instrumented when profiling is enabled (python -m aoc run --profile)
+HOT_FUNCTIONS = ("move_and_count_blocks",)
 GUARD_DIRECTION = {"v": (1,0), "^": (-1,0), ">" : (0,1), "<": (0,-1)}
-GUARD_TURN = {"v": "<", "<": "^", "^": ">", ">":"v" }
-OBSTACLE = "#"
-
-rows=0 
-cols=0
+# The grid holds byte values
+OBSTACLE = ord("#")
+EMPTY = ord(".")
+# Directions in clockwise order, so turning right moves to the next one
+DIRECTION_ICONS = "^>v<"
+DIRECTION_COUNT = len(DIRECTION_ICONS)
 
 X_IDX = 1
 Y_IDX = 0
@@ -23,50 +27,204 @@ class Guard():
         self._y = y
         self._x = x
         self._icon = icon
-        self._direction = GUARD_DIRECTION[icon]
         
     def x(self):
         return self._x
     def y(self):
         return self._y
-    def new_x(self):
-        return self._x + self._direction[X_IDX]
-    def new_y(self):
-        return self._y + self._direction[Y_IDX]
     def icon(self):
         return self._icon
-        
-    def is_move_in_bounds(self) ->bool:
-        new_x = self._x + self._direction[X_IDX]
-        new_y = self._y + self._direction[Y_IDX]
-        return self._is_in_bounds(new_y,new_x)
-    
-    def _is_in_bounds(self,y,x) -> bool:
-        return (0 <= y < rows)  and (0 <= x < cols)
-    
-    def is_in_bounds(self) -> bool:
-        return self._is_in_bounds(self._y,self._x)
-        
-    def move(self):
-        self._x = self._x + self._direction[X_IDX]
-        self._y = self._y + self._direction[Y_IDX]
-        
-    def rotate(self):
-        self._icon = GUARD_TURN[self._icon]
-        self._direction = GUARD_DIRECTION[self._icon]
-        
-    def obstacle(self,grid) -> bool:
-        new_x = self._x + self._direction[X_IDX]
-        new_y = self._y + self._direction[Y_IDX]
-        return grid[new_y][new_x] == OBSTACLE
-    
-    def vector_pos(self) -> tuple:
-        return (self._y, self._x,self._icon)
-    
-    def pos(self) -> tuple:
-        return (self._y, self._x)
 
-def read_input(file_name:str) -> list:
+class GuardMap:
+    """
+    A jump table for moving the guard from one turn to the next.
+
+    Cells are numbered y * cols + x and directions follow DIRECTION_ICONS.
+    For each cell and direction the table holds the cell where a guard
+    walking that way stops: the cell in front of the next obstacle, or for
+    a guard that walks off the grid, the last cell it is on stored as
+    ~cell (a negative number). A walk then costs one lookup per turn
+    rather than one per step.
+
+    An extra obstacle only changes the stops of cells in line behind it,
+    and loop checks only look the table up where the guard turns, in front
+    of an obstacle. Each such turn cell is chained to the next one behind
+    it, so placing an obstacle patches just those entries. Loop checks
+    stamp the turns they make into a reusable array with a generation
+    counter, so no set is built per check.
+
+    Attributes:
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+        cells (bytes): The grid contents, indexed by cell number.
+        steps (tuple): The change in cell number for a step in each direction.
+        jumps (list): The stop for a cell and direction at jumps[cell * 4 + direction].
+        behind (list): The nearest turn cell behind a cell for a direction, or -1,
+            at the same index as jumps. Built when the first obstacle is placed.
+        turns (list): The generation that last made the turn at jumps' index.
+        generation (int): The number of loop checks made.
+    """
+    def __init__(self, grid) -> None:
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.cells = b"".join(bytes(grid[y]) for y in range(self.rows))
+        self.steps = tuple(GUARD_DIRECTION[icon][Y_IDX] * self.cols + GUARD_DIRECTION[icon][X_IDX]
+                           for icon in DIRECTION_ICONS)
+        self.jumps = [0] * (self.rows * self.cols * DIRECTION_COUNT)
+        for direction, icon in enumerate(DIRECTION_ICONS):
+            step_y, step_x = GUARD_DIRECTION[icon]
+            # Cells are visited after the cell in front of them, whose stop they share
+            ys, xs = self._get_sweep(step_y, step_x)
+            for y in ys:
+                ahead_y = y + step_y
+                row_ahead = grid[ahead_y] if 0 <= ahead_y < self.rows else None
+                for x in xs:
+                    cell = y * self.cols + x
+                    ahead_x = x + step_x
+                    if row_ahead is None or not 0 <= ahead_x < self.cols:
+                        stop = ~cell
+                    elif row_ahead[ahead_x] == OBSTACLE:
+                        stop = cell
+                    else:
+                        stop = self.jumps[(cell + self.steps[direction]) * DIRECTION_COUNT
+                                          + direction]
+                    self.jumps[cell * DIRECTION_COUNT + direction] = stop
+        self.behind = None
+        self.turns = [0] * len(self.jumps)
+        self.generation = 0
+
+    def _link_turns(self) -> None:
+        """ Builds the behind chains used by place_obstacle"""
+        self.behind = [-1] * len(self.jumps)
+        for direction, icon in enumerate(DIRECTION_ICONS):
+            back_y, back_x = -GUARD_DIRECTION[icon][Y_IDX], -GUARD_DIRECTION[icon][X_IDX]
+            # A turn cell for this direction is where a guard walking the previous one stops
+            turning_from = (direction - 1) % DIRECTION_COUNT
+            ys, xs = self._get_sweep(back_y, back_x)
+            for y in ys:
+                if not 0 <= y + back_y < self.rows:
+                    continue
+                for x in xs:
+                    if not 0 <= x + back_x < self.cols:
+                        continue
+                    cell = y * self.cols + x
+                    back = cell - self.steps[direction]
+                    if self.cells[back] == OBSTACLE:
+                        continue
+                    if self.jumps[back * DIRECTION_COUNT + turning_from] == back:
+                        nearest = back
+                    else:
+                        nearest = self.behind[back * DIRECTION_COUNT + direction]
+                    self.behind[cell * DIRECTION_COUNT + direction] = nearest
+
+    def _get_sweep(self, step_y:int, step_x:int) -> tuple:
+        """ Returns the rows and columns in an order that visits the cell a step away first"""
+        ys = range(self.rows - 1, -1, -1) if step_y > 0 else range(self.rows)
+        xs = range(self.cols - 1, -1, -1) if step_x > 0 else range(self.cols)
+        return ys, xs
+
+    def get_state(self, guard:Guard) -> tuple:
+        """ Returns the cell number and direction index of a guard"""
+        return guard.y() * self.cols + guard.x(), DIRECTION_ICONS.index(guard.icon())
+
+    def get_stop(self, cell:int, direction:int) -> tuple:
+        """
+        Finds where a guard stops walking straight from a cell.
+
+        Returns:
+            tuple: The cell where the guard stops, and True if it then walks
+            off the grid rather than turning.
+        """
+        stop = self.jumps[cell * DIRECTION_COUNT + direction]
+        if stop < 0:
+            return ~stop, True
+        return stop, False
+
+    def place_obstacle(self, cell:int) -> list:
+        """
+        Patches the jump table for an extra obstacle on an empty cell.
+
+        Only the turn cells in line behind the obstacle are patched, so
+        until restore is called the table may only be looked up from a
+        cell where the guard turns.
+
+        Args:
+            cell (int): The cell to place the obstacle on.
+
+        Returns:
+            list: The (index, stop) entries that were replaced, for restore.
+        """
+        if self.behind is None:
+            self._link_turns()
+        replaced = []
+        for direction, step in enumerate(self.steps):
+            stop = cell - step
+            behind = self.behind[cell * DIRECTION_COUNT + direction]
+            while behind >= 0:
+                index = behind * DIRECTION_COUNT + direction
+                replaced.append((index, self.jumps[index]))
+                self.jumps[index] = stop
+                behind = self.behind[index]
+        return replaced
+
+    def restore(self, replaced:list) -> None:
+        """ Undoes place_obstacle, given the entries it replaced"""
+        for index, stop in replaced:
+            self.jumps[index] = stop
+
+    def count_visited(self, cell:int, direction:int) -> int:
+        """
+        Counts the distinct cells a guard visits before walking off the grid.
+
+        The walk is a chain of straight segments, one per turn. Each segment
+        is stamped into a bytearray with one strided slice assignment, so
+        the count of the union of the segments is exact.
+
+        Raises:
+            ValueError: If the guard walks in a loop and never leaves.
+        """
+        visited = bytearray(self.rows * self.cols)
+        turns = set()
+        while True:
+            stop, exits = self.get_stop(cell, direction)
+            step = self.steps[direction]
+            first, last = (cell, stop) if step > 0 else (stop, cell)
+            visited[first:last + 1:abs(step)] = b"\x01" * ((last - first) // abs(step) + 1)
+            if exits:
+                return visited.count(1)
+            if (stop, direction) in turns:
+                raise ValueError("The guard walks in a loop and never leaves the grid")
+            turns.add((stop, direction))
+            cell = stop
+            direction = (direction + 1) % DIRECTION_COUNT
+
+    def is_loop(self, cell:int, direction:int) -> bool:
+        """
+        Determines if a guard walks in a loop, jumping from turn to turn.
+
+        Args:
+            cell (int): The cell the guard starts on.
+            direction (int): The direction the guard starts facing.
+
+        Returns:
+            bool: True if the guard comes back to a turn it has already made.
+        """
+        self.generation += 1
+        generation = self.generation
+        jumps = self.jumps
+        turns = self.turns
+        while True:
+            turn = cell * DIRECTION_COUNT + direction
+            cell = jumps[turn]
+            if cell < 0:
+                return False
+            turn = cell * DIRECTION_COUNT + direction
+            if turns[turn] == generation:
+                return True
+            turns[turn] = generation
+            direction = (direction + 1) % DIRECTION_COUNT
+
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -74,14 +232,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A grid of the file, indexed as grid[y][x]
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).grid()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -92,90 +245,81 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
-def find_position_and_direction(grid) -> Guard:
+def find_position_and_direction(grid, rows:int, cols:int) -> Guard:
     icon = ''
     for y in range(rows):
         for x in range(cols):
             contents = grid[y][x]
-            if contents not in (".","#"):   
+            if contents not in (EMPTY,OBSTACLE):   
                 pos_x = x
                 pos_y = y
-                icon = contents
+                icon = chr(contents)
                 break
     return Guard(pos_y,pos_x,icon)
 
 def move_and_count(grid: list,guard: Guard) -> int:
-    positions = set()
-
-    while guard.is_in_bounds():
-        has_updated = False
-        positions.add(guard.pos())
-        if guard.is_move_in_bounds():
-            if guard.obstacle(grid):
-                guard.rotate()
-                has_updated = True
-        if not has_updated:
-            guard.move()
-            
-    return len(positions)
+    guard_map = GuardMap(grid)
+    return guard_map.count_visited(*guard_map.get_state(guard))
 
 def move_and_count_blocks(grid: list ,guard: Guard) ->int:
-    block_positions = set()
-    while guard.is_in_bounds():
-        if guard.is_move_in_bounds():
-            if not guard.obstacle(grid):
-                new_y = guard.new_y()
-                new_x = guard.new_x()
-                if not (guard.pos() in block_positions):
-                    grid[new_y][new_x] = OBSTACLE
-                    if is_loop(grid, deepcopy(guard)):
-                        block_positions.add(guard.pos())
-                    grid[new_y][new_x] = '.'
-                guard.move()
-            else:
-                guard.rotate()
-        else:
-            guard.move()
-    
-    return len(block_positions)
+    """
+    Counts the cells where one extra obstacle makes the guard walk in a loop.
+
+    Only cells on the guard's original path can change its walk, so the path
+    is followed turn to turn and each cell on it is tried once, the first
+    time the guard reaches it. The loop check starts from where the guard
+    stands just before that cell, as the walk up to there is unchanged,
+    having turned to face away from the new obstacle.
+    """
+    guard_map = GuardMap(grid)
+    cell, direction = guard_map.get_state(guard)
+    tried = bytearray(len(guard_map.cells))
+    tried[cell] = 1
+    turns = set()
+    blocks = 0
+    while True:
+        stop, exits = guard_map.get_stop(cell, direction)
+        step = guard_map.steps[direction]
+        for ahead in range(cell + step, stop + step, step):
+            if not tried[ahead]:
+                tried[ahead] = 1
+                replaced = guard_map.place_obstacle(ahead)
+                if guard_map.is_loop(ahead - step, (direction + 1) % DIRECTION_COUNT):
+                    blocks += 1
+                guard_map.restore(replaced)
+        if exits:
+            return blocks
+        if (stop, direction) in turns:
+            raise ValueError("The guard walks in a loop and never leaves the grid")
+        turns.add((stop, direction))
+        cell = stop
+        direction = (direction + 1) % DIRECTION_COUNT
             
 
 def is_loop(grid:list, guard:Guard) -> bool:
-    positions = set()
-    while guard.is_in_bounds():
-        positions.add(guard.vector_pos())
-        if guard.is_move_in_bounds():
-            if guard.obstacle(grid):
-                guard.rotate()
-            else:
-                guard.move()
-        else:
-            return False
-        if guard.vector_pos() in positions:
-            return True
-            
-    
+    guard_map = GuardMap(grid)
+    return guard_map.is_loop(*guard_map.get_state(guard))
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    grid = read_input(file_name)
+    guard = find_position_and_direction(grid, grid.rows, grid.cols)
+    return move_and_count(grid,guard)
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    grid = read_input(file_name)
+    guard = find_position_and_direction(grid, grid.rows, grid.cols)
+    return move_and_count_blocks(grid,guard)
+
 def main():
     """ Main function
         Reads the specified input file
         
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    grid = [None] * len(file_data)
-    for i,line in enumerate(file_data):
-        grid[i] = list(line.strip() )
-    global rows
-    global cols
-    rows = len(grid)
-    cols = len(grid[0])
-    guard = find_position_and_direction(grid)
-    unique_locations = move_and_count(grid,guard)
-    print(unique_locations)
-    
-    guard = find_position_and_direction(grid)
-    block_locations = move_and_count_blocks(grid,guard)
-    print(block_locations)
+    print(part_1(file_name))
+    print(part_2(file_name))
     
 
 if __name__ == "__main__":
@@ -5,14 +5,16 @@ https://adventofcode.com/2024/day/x
 import os
 import sys
 from itertools import product
-from time import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
 MULTIPLY = "*"
 ADD = "+"
 CONCAT = "||"
 
-def read_input(file_name:str) -> list:
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -20,14 +22,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A lazy iterator over the lines of the mapped file, as bytes
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).lines()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -49,8 +46,8 @@ def count_valid_equations(file_data, is_part_one = True) -> int:
     is_part_one flag.
 
     Args:
-        file_data (list of str): List of strings, each representing a line with an expected
-                                answer and a sequence of numbers.
+        file_data (iterable of bytes): Lines, each with an expected answer and a
+                                sequence of numbers.
         is_part_one (bool): Flag to determine the set of operators to use. If True, only
                             "+" and "*" are used. If False, "||" is also included.
 
@@ -58,9 +55,8 @@ def count_valid_equations(file_data, is_part_one = True) -> int:
         int: The sum of all valid equations that match the expected answers.
     """
     sum_valid = 0
-    start = time()
     for line in file_data:
-        parts = line.strip().split(":")
+        parts = line.strip().split(b":")
         answer = int(parts[0])
         numbers = [int(n) for n in parts[1].split()]
         num_operators = len(numbers) -1
@@ -85,18 +81,24 @@ def count_valid_equations(file_data, is_part_one = True) -> int:
             if answer == result:
                 sum_valid += result
                 break
-    print (f"Time taken = {time()-start}")
     return sum_valid
 
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return count_valid_equations(read_input(file_name))
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return count_valid_equations(read_input(file_name),False)
+
 def main():
     """ Main function
         Reads the specified input file
         
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    print(count_valid_equations(file_data))
-    print(count_valid_equations(file_data,False))
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
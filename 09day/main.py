@@ -4,9 +4,13 @@ https://adventofcode.com/2024/day/x
 """
 import os
 import sys
-from copy import deepcopy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
+# Functions instrumented when profiling is enabled (python -m aoc run --profile)
+HOT_FUNCTIONS = ("compact",)
 FREE_SPACE = '.'
 
 def read_input(file_name:str) -> str:
@@ -14,14 +18,12 @@ def read_input(file_name:str) -> str:
 
     Args:
         file_name (str): Name of the input file
-        File is in same location as the python code
+        File is in same location as the python code, or "-" for stdin
         
     Returns:
-        A list of the lines in the file
+        A string with the contents of the file
     """
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        return input_data.read()
+    return open_input(file_name, os.path.dirname(__file__)).text()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -32,9 +34,9 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
-def create_map(input_data: list) ->tuple[list,list,dict,int]:
+def create_map(input_data: list) ->tuple[list,dict,dict,int]:
     disk_map=[]
-    free_space_blocks = list()
+    free_space_blocks = dict()
     file_blocks = dict()
     for i,value in enumerate(input_data):
         if (i%2) == 0:
@@ -44,7 +46,7 @@ def create_map(input_data: list) ->tuple[list,list,dict,int]:
         else:
             char = FREE_SPACE
             pos = '{0:07d}'.format(len(disk_map))
-            free_space_blocks.append(pos,int(value))
+            free_space_blocks[pos] = int(value)
         for _ in range(int(value)):
             disk_map.append(char)
     return disk_map,free_space_blocks,file_blocks,file_num
@@ -91,20 +93,25 @@ def compact_without_fragmentation(disk_map,free_space_map,file_map,file_count) -
                 break
         file_count -= 1
     return disk_map
-    
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    disk_map = create_map(list(read_input(file_name).strip()))[0]
+    return checksum(compact(disk_map))
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    disk_map, free_space_map, file_map,file_count = create_map(list(read_input(file_name).strip()))
+    return checksum(compact_without_fragmentation(disk_map,free_space_map,file_map,file_count))
+
 def main():
     """ Main function
         Reads the specified input file
         
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    disk_map, free_space_map, file_map,file_count = create_map(list(file_data.strip()))
-    compacted_map = compact(deepcopy(disk_map))
-    print(checksum(compacted_map))
-  
-    compacted_map_no_frag = compact_without_fragmentation(disk_map,free_space_map,file_map,file_count)
-    print(checksum(compacted_map_no_frag))
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
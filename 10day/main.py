@@ -5,8 +5,16 @@ https://adventofcode.com/2024/day/10
 import os
 import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
+
 DEFAULT_FILE_NAME = "input.txt"
+# Functions instrumented when profiling is enabled (python -m aoc run --profile)
+HOT_FUNCTIONS = ("count_paths_from_head",)
 DIRECTIONS = [(-1,0),(1,0),(0,1),(0,-1)]
+# The map holds byte values; the digits are consecutive so heights compare directly
+TRAIL_HEAD = ord("0")
+PEAK = ord("9")
 
 class Counts:
     """
@@ -43,7 +51,7 @@ class Counts:
         return self._part_2
         
 
-def read_input(file_name:str) -> list:
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -51,14 +59,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A grid view of the mapped file, indexed as grid[y][x]
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).grid()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -76,7 +79,7 @@ def get_trail_heads(topographic_map:list) -> list:
     A trail head is defined as a point with a height of "0" in the map.
 
     Args:
-        topographic_map (list): A 2D list representing the topographic map, where each element is a character indicating the height.
+        topographic_map (Grid): The topographic map, where each element is the byte value of a height digit.
 
     Returns:
         list: A list of tuples, each containing the (y, x) coordinates of a trail head.
@@ -84,7 +87,7 @@ def get_trail_heads(topographic_map:list) -> list:
     trail_heads = list()
     for y,_ in enumerate(topographic_map):
         for x,height in enumerate(topographic_map[y]):
-            if height == "0":
+            if height == TRAIL_HEAD:
                 trail_heads.append((y,x))
     return trail_heads
 
@@ -97,7 +100,7 @@ def count_paths(topographic_map: list, trail_heads: list,counts: Counts):
     to avoid counting duplicates.
 
     Args:
-        topographic_map (list): A 2D list representing the topographic map.
+        topographic_map (Grid): The topographic map.
         trail_heads (list): A list of tuples representing the starting points
                             for path counting.
     """
@@ -120,7 +123,7 @@ def count_paths_from_head(topographic_map: list,
     If a path reaches a value of 9, it updates the counts accordingly.
 
     Parameters:
-        topographic_map (list): A 2D list representing the topographic map.
+        topographic_map (Grid): The topographic map.
         location (tuple): The current location in the map as (row, column).
         start (tuple): The starting location of the path.
         visited (set): A set of visited paths to avoid revisiting.
@@ -129,15 +132,15 @@ def count_paths_from_head(topographic_map: list,
     Returns:
         None
 """
-    start_value = int(topographic_map[location[0]][location[1]])
+    start_value = topographic_map[location[0]][location[1]]
     rows = len(topographic_map)
     cols = len(topographic_map[0])
     for direction in DIRECTIONS:
         new_loc = (location[0] + direction[0], location[1] + direction[1])
         if 0 <= new_loc[0] < rows and 0 <= new_loc[1] < cols:
-            new_value = int(topographic_map[new_loc[0]][new_loc[1]])
+            new_value = topographic_map[new_loc[0]][new_loc[1]]
             if new_value == start_value +1:
-                if new_value == 9:
+                if new_value == PEAK:
                     if not (start,new_loc) in visited:
                         counts.inc_part_1()
                         visited.add((start, new_loc))
@@ -146,6 +149,22 @@ def count_paths_from_head(topographic_map: list,
                     count_paths_from_head(topographic_map, new_loc, start, visited,counts)
 
 
+def get_counts(file_name:str) -> Counts:
+    """ Reads the input file and counts the paths from every trail head"""
+    topographic_map = read_input(file_name)
+    trail_heads = get_trail_heads(topographic_map)
+    counts = Counts()
+    count_paths(topographic_map,trail_heads,counts)
+    return counts
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return get_counts(file_name).part_1()
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return get_counts(file_name).part_2()
+
 def main():
     """ Main function
         Reads the specified input file
@@ -155,11 +174,7 @@ def main():
         Prints the results
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    topographic_map = [list(s.strip()) for s in file_data]
-    trail_heads = get_trail_heads(topographic_map)
-    counts = Counts()
-    count_paths(topographic_map,trail_heads,counts)
+    counts = get_counts(file_name)
     print(counts.part_1())
     print(counts.part_2())
 
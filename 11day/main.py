@@ -5,7 +5,9 @@ https://adventofcode.com/2024/day/11
 import os
 import sys
 from copy import deepcopy
-from itertools import product
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 def get_directions(are_diagonals_valid = False) -> list:
     """
@@ -17,14 +19,17 @@ def get_directions(are_diagonals_valid = False) -> list:
         except (0, 0). Otherwise, includes only cardinal directions.
     """
     if are_diagonals_valid:
+        from itertools import product   # pylint: disable=import-outside-toplevel
         directions = list(product([-1, 0, 1], repeat=2))
-        directions.remove(0,0)
+        directions.remove((0,0))
     else:
         directions = [(-1,0),(1,0),(0,1),(0,-1)]
     return directions
 
 DIRECTIONS = get_directions(False)
 DEFAULT_FILE_NAME = "input.txt"
+# Functions instrumented when profiling is enabled (python -m aoc run --profile)
+HOT_FUNCTIONS = ("stones_after_blinks",)
 MULTIPLIER = 2024
 
 def read_input(file_name:str) -> list:
@@ -32,15 +37,12 @@ def read_input(file_name:str) -> list:
 
     Args:
         file_name (str): Name of the input file
-        File is in same location as the python code
+        File is in same location as the python code, or "-" for stdin
         
     Returns:
-        A list of the lines in the file
+        A string with the contents of the file
     """
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-       with open(file, encoding="utf-8") as input_data:
-        return input_data.read()
+    return open_input(file_name, os.path.dirname(__file__)).text()
 
 
 def get_file_name() -> str:
@@ -72,7 +74,12 @@ def stones_after_blinks(stones, blinks:int) -> int:
                 stones[i] = str(int(stone) * MULTIPLIER)
             i += 1
     return len(stones)
-        
+
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file"""
+    stones = read_input(file_name).strip().split()
+    return stones_after_blinks(stones, 25)
+
 def main():
     """ Main function
         Reads the specified input file
@@ -80,10 +87,7 @@ def main():
         
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    stones = file_data.strip().split()
-    count = stones_after_blinks(stones, 25)
-    print(count)
+    print(part_1(file_name))
     
     # count = stones_after_blinks(stones, 50)
     # print(count)
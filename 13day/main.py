@@ -6,28 +6,26 @@ import os
 import sys
 import re
 
-import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
 COST_A = 3
 COST_B = 1
 SOLUTION_EXISTS_IDX = 0
-def read_input(file_name:str) -> list:
+# Numbers describing a machine: button A x and y, button B x and y, prize x and y
+MACHINE_NUMBERS = 6
+def read_input(file_name:str):
     """Read input file
 
     Args:
         file_name (str): Name of the input file
-        File is in same location as the python code
+        File is in same location as the python code, or "-" for stdin
         
     Returns:
-        A list of the lines in the file
+        A lazy iterator over the lines of the file, as bytes
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).lines()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -43,12 +41,12 @@ def extract_numbers(text) -> list:
     Extract all numeric sequences from the given text.
 
     Args:
-        text (str): The input string from which to extract numbers.
+        text (bytes): The input line from which to extract numbers.
 
     Returns:
-        list: A list of strings, each representing a sequence of digits found in the text.
+        list: A list of bytes, each representing a sequence of digits found in the text.
     """
-    return re.findall(r'\d+', text)
+    return re.findall(rb'\d+', text)
 
 def solve(ax,ay, bx,by,px,py,is_part_one):
     """
@@ -68,6 +66,8 @@ def solve(ax,ay, bx,by,px,py,is_part_one):
         (both components are integers when rounded to three decimal places) and 
         the solution array of the linear equations.
     """
+    # numpy is slow to import, so it is only loaded once there is something to solve
+    import numpy as np   # pylint: disable=import-outside-toplevel
     left = np.array([[ax,ay],[bx,by]])
     if not is_part_one:
         px += 10000000000000
@@ -77,41 +77,63 @@ def solve(ax,ay, bx,by,px,py,is_part_one):
     is_valid = round(solution[0],3).is_integer() and round(solution[1],3).is_integer()
     return(is_valid, solution)
 
+def get_machines(file_data):
+    """
+    Lazily collects the numbers describing each claw machine.
+
+    Parameters:
+        file_data (iterable): The lines of the input.
+
+    Yields:
+        list: The six numbers of a machine, as soon as its prize line has been read.
+    """
+    numbers = []
+    for line in file_data:
+        numbers.extend(int(num) for num in extract_numbers(line))
+        if len(numbers) >= MACHINE_NUMBERS:
+            yield numbers
+            numbers = []
+
 def process_input(file_data,is_part_one=True):
     """
     Processes the input data to calculate a total answer based on extracted numbers
     and their solutions from a system of linear equations.
 
+    Machines are solved as they are read, so memory use does not grow with
+    the number of machines.
+
     Parameters:
-        file_data (list): A list of strings representing the input data.
+        file_data (iterable): The lines of the input.
         is_part_one (bool, optional): A flag indicating whether to adjust the target 
         point in the linear equations. Defaults to True.
 
     Returns:
         int: The calculated total answer based on the solutions of the linear equations.
     """
-    i = 0
-    line_count = len(file_data)
     answer = 0
-    while i < line_count:
-        text = f"{file_data[i]}{file_data[i+1]}{file_data[i+2]}"
-        i += 4
-        numbers = [int(num) for num in extract_numbers(text)]
+    for numbers in get_machines(file_data):
         moves = solve(numbers[0],numbers[2],numbers[1],numbers[3],numbers[4],numbers[5],is_part_one)
         if moves[SOLUTION_EXISTS_IDX]:
             answer +=  moves[1][0] * COST_A + moves[1][1] * COST_B
     return answer
 
+def part_1(file_name:str):
+    """ Solves Part 1 of the puzzle for the given input file"""
+    return process_input(read_input(file_name))
+
+def part_2(file_name:str):
+    """ Solves Part 2 of the puzzle for the given input file"""
+    return process_input(read_input(file_name),False)
+
 def main():
     """ Main function
         Reads the specified input file
         process the data for part 1 and part 2
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
     # data_2d = [list(s.strip()) for s in file_data]
-    print(process_input(file_data))
-    print(process_input(file_data,False))
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
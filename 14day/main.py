@@ -4,24 +4,14 @@ https://adventofcode.com/2024/day/14
 """
 import os
 import sys
-import re
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import open_input  # pylint: disable=wrong-import-position
 
 DEFAULT_FILE_NAME = "input.txt"
 SECONDS = 100
 
-def extract_numbers(text) -> list:
-    """
-    Extract all numeric sequences from the given text.
-
-    Args:
-        text (str): The input string from which to extract numbers.
-
-    Returns:
-        list: A list of strings, each representing a sequence of digits found in the text.
-    """
-    return re.findall(r'-?\d+', text)
-
-def read_input(file_name:str) -> list:
+def read_input(file_name:str):
     """Read input file
 
     Args:
@@ -29,14 +19,9 @@ def read_input(file_name:str) -> list:
         File is in same location as the python code
         
     Returns:
-        A list of the lines in the file
+        A lazy iterator giving the list of integers on each line of the mapped file
     """
-    file_data = []
-    file = os.path.join(os.path.dirname(__file__), file_name)
-    with open(file, encoding="utf-8") as input_data:
-        for line in input_data:
-            file_data.append(line)
-    return file_data
+    return open_input(file_name, os.path.dirname(__file__)).int_rows()
 
 def get_file_name() -> str:
     """ Returns the base file name for the input to problem
@@ -47,31 +32,30 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
-def get_position_and_velocity(file_data: list) -> list:
+def get_position_and_velocity(file_data):
     """
-    Extracts position and velocity data from a list of strings.
+    Lazily collects position and velocity data for each robot.
 
     Args:
-        file_data (list): A list of strings, each containing numeric data.
+        file_data (iterable): The integers on each line of the input.
 
-    Returns:
-        list: A list of lists, where each inner list contains integers representing
-        the extracted position and velocity data from each string in the input list.
+    Yields:
+        list: The integers giving the position and velocity of a robot,
+        one list for each non-blank line of the input.
 """
-    position_and_velocity = []
-    for line in file_data:
-        position_and_velocity.append([int(num) for num in extract_numbers(line)])
-    return position_and_velocity
+    for numbers in file_data:
+        if numbers:
+            yield numbers
 
 def move_robots(position_and_velocity, is_test):
     """
-    Moves robots based on their current position and velocity, updating their
-    positions over a fixed number of seconds. Determines the number of robots
+    Moves robots based on their current position and velocity over a fixed
+    number of seconds, without changing the input. Determines the number of robots
     in each of four quadrants of a grid and returns the product of these counts.
 
     Parameters:
-        position_and_velocity (list of lists): A list where each element is a list
-            containing the x and y positions and velocities of a robot [x, y, vx, vy].
+        position_and_velocity (iterable of lists): The x and y positions and
+            velocities of each robot [x, y, vx, vy], read once.
         is_test (bool): A flag indicating whether to use test grid dimensions or
             actual grid dimensions.
 
@@ -94,31 +78,35 @@ def move_robots(position_and_velocity, is_test):
         quad_2_3_y = range(52,103)
     quad = [0,0,0,0]    
     for robot in position_and_velocity:
-        robot[0] = (robot[0] + robot[2] * SECONDS) % cols
-        robot[1] = (robot[1] + robot[3] * SECONDS) % rows
-        if robot[0] in quad_1_3_x and robot[1] in quad_1_4_y:
+        x = (robot[0] + robot[2] * SECONDS) % cols
+        y = (robot[1] + robot[3] * SECONDS) % rows
+        if x in quad_1_3_x and y in quad_1_4_y:
             quad[0] += 1
-        if robot[0] in quad_1_3_x and robot[1] in quad_2_3_y:
+        if x in quad_1_3_x and y in quad_2_3_y:
             quad[2] += 1
-        if robot[0] in quad_2_4_x and robot[1] in quad_1_4_y:
+        if x in quad_2_4_x and y in quad_1_4_y:
             quad[3] += 1
-        if robot[0] in quad_2_4_x and robot[1] in quad_2_3_y:
+        if x in quad_2_4_x and y in quad_2_3_y:
             quad[1] += 1
     return quad[0] * quad[1] * quad[2] * quad[3]
 
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file
+        Uses file name to determine if this is a test run
+    """
+    is_test =  "test" in os.path.basename(file_name)
+    position_and_velocity = get_position_and_velocity(read_input(file_name))
+    return move_robots(position_and_velocity,is_test)
+
 def main():
     """ Main function
         Reads the specified input file
         Uses file name to determine if this is a test run
-        Gets a list of initial position and velocity
+        Gets the initial position and velocity of each robot
         Processes list to obtain result
     """
     file_name = get_file_name()
-    is_test =  "test" in file_name
-    file_data = read_input(file_name)
-    position_and_velocity = get_position_and_velocity(file_data)
-    result = move_robots(position_and_velocity,is_test)
-    print(result)
+    print(part_1(file_name))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+"""
+Shared tooling for the Advent of Code 2024 solutions
+
+Each day lives in its own NNday/main.py script. This package loads those
+scripts as modules so that every day can be run and measured from a
+single Python process:
+
+    python -m aoc run 1-14
+"""
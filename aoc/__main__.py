@@ -0,0 +1,209 @@
+"""
+Command line entry point for the shared tooling
+
+    python -m aoc run 1-14
+    python -m aoc run 6 --test
+    python -m aoc run 1-14 --json > timings.json
+    python -m aoc run 1-14 --jobs 8
+    python -m aoc run 6 --profile day6.folded
+    python -m aoc generate 1-14 --scale 10000 --seed 7
+    python -m aoc bench 1-14 --save
+    python -m aoc bench 1-14 --threshold 0.25
+    python -m aoc daemon &
+    python -m aoc client 6 2 test_input.txt
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+from aoc import benchmark, cache, daemon, generators, profiling, runner
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Builds the argument parser for all sub commands"""
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2024 tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run solvers and time each part")
+    run_parser.add_argument("days", nargs="?", default=f"{runner.FIRST_DAY}-{runner.LAST_DAY}",
+                            help="days to run, e.g. 1-14 or 1,3,5-7 (default: all)")
+    run_parser.add_argument("--input", default=runner.DEFAULT_FILE_NAME,
+                            help="input file name in each day's directory, or a path")
+    run_parser.add_argument("--test", action="store_true",
+                            help="use each day's example input")
+    run_parser.add_argument("--part", type=int, choices=runner.PARTS,
+                            help="only run this part")
+    run_parser.add_argument("--no-memory", action="store_true",
+                            help="do not trace allocations (more accurate timings)")
+    run_parser.add_argument("--json", action="store_true",
+                            help="write results as JSON")
+    run_parser.add_argument("--profile", metavar="FILE",
+                            help="profile hot functions, writing collapsed stacks to FILE "
+                                 f"(same as setting {profiling.PROFILE_ENV}); "
+                                 "implies --no-memory and --no-cache")
+    run_parser.add_argument("--jobs", type=int, default=1,
+                            help="run parts on this many worker processes, longest first "
+                                 "by the benchmark baseline (default: %(default)s)")
+    run_parser.add_argument("--no-cache", action="store_true",
+                            help="always run the solvers, bypassing the result cache")
+    run_parser.add_argument("--cache-dir", default=cache.CACHE_DIR,
+                            help="result cache directory (default: %(default)s)")
+    run_parser.add_argument("--cache-size", type=int, default=cache.DEFAULT_MAX_BYTES,
+                            help="result cache size limit in bytes (default: %(default)s)")
+
+    generate_parser = commands.add_parser("generate", help="write large synthetic inputs")
+    generate_parser.add_argument("days", help="days to generate input for, e.g. 1-14")
+    generate_parser.add_argument("--scale", type=int, required=True,
+                                 help="size of the input (meaning depends on the day)")
+    generate_parser.add_argument("--seed", type=int, default=generators.DEFAULT_SEED,
+                                 help="random seed (default: %(default)s)")
+    generate_parser.add_argument("--output-dir", default=generators.OUTPUT_DIR,
+                                 help="directory to write to (default: %(default)s)")
+
+    bench_parser = commands.add_parser("bench", help="benchmark scaling and check for regressions")
+    bench_parser.add_argument("days", nargs="?", default=f"{runner.FIRST_DAY}-{runner.LAST_DAY}",
+                              help="days to benchmark (default: all)")
+    bench_parser.add_argument("--baseline", default=benchmark.BASELINE_FILE,
+                              help="baseline file (default: %(default)s)")
+    bench_parser.add_argument("--save", action="store_true",
+                              help="save the results as the new baseline instead of comparing")
+    bench_parser.add_argument("--threshold", type=float, default=benchmark.DEFAULT_THRESHOLD,
+                              help="allowed slow down as a fraction (default: %(default)s)")
+    bench_parser.add_argument("--repeat", type=int, default=benchmark.DEFAULT_REPEAT,
+                              help="runs per scale, the fastest is kept (default: %(default)s)")
+    bench_parser.add_argument("--seed", type=int, default=generators.DEFAULT_SEED,
+                              help="seed for the generated inputs (default: %(default)s)")
+    bench_parser.add_argument("--import-budget", type=float,
+                              default=benchmark.DEFAULT_IMPORT_BUDGET,
+                              help="seconds each day may take to import (default: %(default)s)")
+    bench_parser.add_argument("--json", action="store_true",
+                              help="write results as JSON")
+
+    daemon_parser = commands.add_parser("daemon", help="serve solvers from a warm process")
+    daemon_parser.add_argument("--socket", default=daemon.DEFAULT_SOCKET,
+                               help="Unix socket to listen on (default: %(default)s)")
+    daemon_parser.add_argument("--max-inputs", type=int, default=daemon.DEFAULT_MAX_INPUTS,
+                               help="inputs kept in memory (default: %(default)s)")
+
+    client_parser = commands.add_parser("client", help="ask the daemon to solve a part")
+    client_parser.add_argument("day", nargs="?", type=int, help="day to solve")
+    client_parser.add_argument("part", nargs="?", type=int, choices=runner.PARTS,
+                               help="part to solve")
+    client_parser.add_argument("file", nargs="?", default=runner.DEFAULT_FILE_NAME,
+                               help="input file (default: %(default)s)")
+    client_parser.add_argument("--socket", default=daemon.DEFAULT_SOCKET,
+                               help="Unix socket of the daemon (default: %(default)s)")
+    client_parser.add_argument("--stats", action="store_true", help="show daemon counters")
+    client_parser.add_argument("--stop", action="store_true", help="stop the daemon")
+    client_parser.add_argument("--json", action="store_true", help="print the full response")
+    return parser
+
+def run_command(args) -> int:
+    """ Runs the requested days and prints the results"""
+    parts = runner.PARTS if args.part is None else (args.part,)
+    if args.profile:
+        os.environ[profiling.PROFILE_ENV] = args.profile
+    # The profiler traces allocations itself, which would upset the runner's peak memory
+    measure_memory = not (args.no_memory or args.profile or os.environ.get(profiling.PROFILE_ENV))
+    profiling_on = bool(args.profile or os.environ.get(profiling.PROFILE_ENV))
+    result_cache = None
+    if not (args.no_cache or profiling_on):
+        result_cache = cache.ResultCache(args.cache_dir, args.cache_size)
+    # Profiles are written at exit, which worker processes skip
+    jobs = 1 if profiling_on else args.jobs
+    estimate = None
+    baseline = benchmark.load_baseline() if jobs > 1 else None
+    if baseline is not None:
+        estimate = functools.partial(benchmark.estimate_time, baseline)
+    start = time.perf_counter()
+    results = runner.run_days(runner.parse_days(args.days), args.input, args.test,
+                              parts, measure_memory, result_cache, jobs, estimate)
+    elapsed = time.perf_counter() - start
+    cache_stats = None if result_cache is None else result_cache.stats()
+    if args.json:
+        print(runner.format_json(results, cache_stats))
+    else:
+        print(runner.format_table(results))
+        if jobs > 1:
+            print(f"Elapsed {elapsed:.4f}s on {jobs} jobs")
+        if cache_stats is not None:
+            print("Cache: " + ", ".join(f"{name} {count}" for name, count in cache_stats.items()))
+    return 1 if any(result.error for result in results) else 0
+
+def generate_command(args) -> int:
+    """ Writes a generated input for each requested day and prints its path"""
+    for day in runner.parse_days(args.days):
+        if day in generators.GENERATORS:
+            print(generators.write_input(day, args.scale, args.seed, args.output_dir,
+                                         overwrite=True))
+    return 0
+
+def bench_command(args) -> int:
+    """
+    Runs the benchmarks, then saves them or compares them with the baseline.
+    Import times are checked against the import budget either way.
+    """
+    days = runner.parse_days(args.days)
+    entries = benchmark.run_benchmarks(days, args.repeat, args.seed, progress=sys.stderr)
+    import_times = benchmark.measure_import_times(days, args.repeat)
+    if args.json:
+        print(json.dumps({"entries": entries, "import_times": import_times}, indent=2))
+    else:
+        print(benchmark.format_entries(entries))
+        print(benchmark.format_import_times(import_times))
+    regressions = benchmark.find_import_regressions(import_times, args.import_budget)
+    if args.save:
+        benchmark.save_baseline(entries, args.baseline)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    else:
+        baseline = benchmark.load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}, run with --save to create one",
+                  file=sys.stderr)
+        else:
+            regressions += benchmark.find_regressions(entries, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+def client_command(args) -> int:
+    """ Sends a request to the daemon and prints the answer"""
+    if args.stop or args.stats:
+        command = "stop" if args.stop else "stats"
+        print(json.dumps(daemon.send({"command": command}, args.socket), indent=2))
+        return 0
+    if args.day is None or args.part is None:
+        print("client needs a day and a part", file=sys.stderr)
+        return 2
+    response = daemon.solve(args.day, args.part, args.file, args.socket)
+    if args.json:
+        print(json.dumps(response, indent=2))
+    elif response["error"] is None:
+        print(response["answer"])
+    if response["error"] is not None:
+        print(f"ERROR {response['error']}", file=sys.stderr)
+        return 1
+    return 0
+
+def main(argv=None) -> int:
+    """ Main function
+        Parses the command line and dispatches to the sub command
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        return run_command(args)
+    if args.command == "generate":
+        return generate_command(args)
+    if args.command == "bench":
+        return bench_command(args)
+    if args.command == "daemon":
+        daemon.serve(args.socket, args.max_inputs)
+        return 0
+    if args.command == "client":
+        return client_command(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
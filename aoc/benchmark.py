@@ -0,0 +1,359 @@
+"""
+Benchmarks each day at several input sizes and gates on regressions
+
+Inputs come from aoc.generators. Each part is timed at every scale in
+BENCH_SCALES, the timings are fitted against a set of growth models, and
+the results are compared with a saved baseline. A run fails if a part is
+more than the threshold slower than the baseline at any size, or if its
+fitted growth class is worse than the baseline's.
+
+The import time of each day's main.py, including everything it imports, is
+also measured in a fresh interpreter with -X importtime, and a run fails
+if any day takes longer to import than the import budget.
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+from aoc import generators, runner
+
+BASELINE_FILE = os.path.join(runner.REPO_ROOT, "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+# Differences below this many seconds are treated as timer noise
+NOISE_FLOOR = 0.005
+# A more complex growth model must cut the fit error by this factor to be chosen
+MODEL_PREFERENCE = 0.3
+# Seconds a day's main.py may take to import, including the modules it imports
+DEFAULT_IMPORT_BUDGET = 0.05
+IMPORT_TIME_PREFIX = "import time:"
+MICROSECONDS = 1_000_000
+
+# Input scales for each day, small enough for the current solvers
+BENCH_SCALES = {
+    1: (1_000_000, 2_000_000, 5_000_000, 10_000_000),
+    2: (125_000, 250_000, 500_000, 1_000_000),
+    3: (20000, 40000, 80000, 160000),
+    4: (50, 100, 200, 400),
+    5: (12_500, 25_000, 50_000, 100_000),
+    6: (16, 24, 32, 48),
+    7: (10, 20, 40),
+    9: (250, 500, 1000, 2000),
+    10: (25, 50, 100, 200),
+    11: (1, 2, 4),
+    13: (250, 500, 1000, 2000),
+    14: (1000, 2000, 4000, 8000),
+}
+# Days whose scale is the side of a square grid, so the input size is scale^2
+GRID_DAYS = (4, 6, 10)
+
+# Growth models from best to worst, as (name, function of input size)
+GROWTH_MODELS = (
+    ("O(1)", lambda n: 1.0),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n^2)", lambda n: n * n),
+    ("O(n^3)", lambda n: n * n * n),
+)
+
+def get_growth_rank(growth:str) -> int:
+    """ Returns the position of a growth class in GROWTH_MODELS, lower is better"""
+    for rank, (name, _) in enumerate(GROWTH_MODELS):
+        if name == growth:
+            return rank
+    raise ValueError(f"Unknown growth class {growth}")
+
+def fit_model(sizes:list, times:list, model) -> float:
+    """
+    Fits time = a + b * model(size) and returns the relative fit error.
+
+    The intercept absorbs fixed costs such as reading the file. If the best
+    intercept is negative the line is refitted through the origin.
+
+    Args:
+        sizes (list): Input sizes.
+        times (list): Measured times in seconds, one per size.
+        model (function): The growth function to fit.
+
+    Returns:
+        float: Root mean square of the relative errors of the fit.
+    """
+    xs = [model(size) for size in sizes]
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_t = sum(times) / count
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        intercept, slope = mean_t, 0.0
+    else:
+        slope = sum((x - mean_x) * (t - mean_t) for x, t in zip(xs, times)) / spread
+        intercept = mean_t - slope * mean_x
+        if intercept < 0 or slope < 0:
+            intercept = 0.0
+            slope = max(sum(x * t for x, t in zip(xs, times)) / sum(x * x for x in xs), 0.0)
+    error = 0.0
+    for x, t in zip(xs, times):
+        predicted = intercept + slope * x
+        error += ((t - predicted) / max(t, NOISE_FLOOR)) ** 2
+    return math.sqrt(error / count)
+
+def fit_growth(sizes:list, times:list) -> str:
+    """
+    Chooses the growth class that best explains the timings.
+
+    Simpler models are preferred unless a more complex one fits clearly
+    better, so timer noise does not flip a linear part to n log n.
+
+    Args:
+        sizes (list): Input sizes.
+        times (list): Measured times in seconds, one per size.
+
+    Returns:
+        str: The name of the chosen growth class, e.g. "O(n)".
+    """
+    if max(times) < NOISE_FLOOR:
+        return GROWTH_MODELS[0][0]
+    best_name = None
+    best_error = None
+    for name, model in GROWTH_MODELS:
+        error = fit_model(sizes, times, model)
+        if best_error is None or error < best_error * MODEL_PREFERENCE:
+            best_name = name
+            best_error = error
+    return best_name
+
+def get_input_size(day:int, scale:int) -> int:
+    """ Returns the input size a scale represents: lines, items, bytes or grid cells"""
+    if day in GRID_DAYS:
+        return scale * scale
+    return scale
+
+def time_part(day:int, part:int, path:str, repeat:int) -> float:
+    """
+    Times one part on one input, returning the best of repeat runs.
+
+    Raises:
+        RuntimeError: If the solver raises.
+    """
+    best = None
+    for _ in range(repeat):
+        result = runner.run_part(day, part, path, measure_memory=False)
+        if result.error is not None:
+            raise RuntimeError(f"Day {day} part {part} failed on {path}: {result.error}")
+        if best is None or result.wall_time < best:
+            best = result.wall_time
+    return best
+
+def benchmark_day(day:int, repeat:int = DEFAULT_REPEAT, seed:int = generators.DEFAULT_SEED) -> dict:
+    """
+    Benchmarks every part of a day at each of its scales.
+
+    Args:
+        day (int): The day to benchmark.
+        repeat (int): Number of runs at each scale, the fastest is kept.
+        seed (int): Seed for the generated inputs.
+
+    Returns:
+        dict: Maps "day.part" to a dict with the scales, the input sizes,
+        the input file sizes in bytes, the timings and the fitted growth class.
+    """
+    module = runner.load_day(day)
+    scales = BENCH_SCALES[day]
+    paths = [generators.write_input(day, scale, seed) for scale in scales]
+    sizes = [get_input_size(day, scale) for scale in scales]
+    entries = {}
+    for part in runner.PARTS:
+        if runner.get_part_solver(module, part) is None:
+            continue
+        times = [time_part(day, part, path, repeat) for path in paths]
+        entries[f"{day}.{part}"] = {
+            "scales": list(scales),
+            "sizes": sizes,
+            "bytes": [os.path.getsize(path) for path in paths],
+            "times": times,
+            "growth": fit_growth(sizes, times),
+        }
+    return entries
+
+def run_benchmarks(days:list, repeat:int = DEFAULT_REPEAT, seed:int = generators.DEFAULT_SEED,
+                   progress=None) -> dict:
+    """
+    Benchmarks each requested day that has a solver and a generator.
+
+    Args:
+        days (list): The days to benchmark.
+        repeat (int): Number of runs at each scale, the fastest is kept.
+        seed (int): Seed for the generated inputs.
+        progress (file): Where to report each day as it starts, if anywhere.
+
+    Returns:
+        dict: The combined entries of every day, see benchmark_day.
+    """
+    entries = {}
+    available_days = runner.find_days()
+    for day in days:
+        if day not in available_days or day not in BENCH_SCALES:
+            continue
+        if progress is not None:
+            print(f"Benchmarking day {day}", file=progress, flush=True)
+        entries.update(benchmark_day(day, repeat, seed))
+    return entries
+
+def parse_import_time(report:str, module_name:str) -> float:
+    """
+    Finds a top level import in the report written by python -X importtime.
+
+    Args:
+        report (str): The importtime report from stderr.
+        module_name (str): The module imported at the top level.
+
+    Returns:
+        float: The cumulative import time of the module in seconds.
+
+    Raises:
+        ValueError: If the module is not in the report.
+    """
+    for line in report.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        fields = line[len(IMPORT_TIME_PREFIX):].split("|")
+        if len(fields) == 3 and fields[2].rstrip() == f" {module_name}":
+            return int(fields[1]) / MICROSECONDS
+    raise ValueError(f"{module_name} is not in the import time report")
+
+def measure_import_time(day:int, repeat:int = DEFAULT_REPEAT) -> float:
+    """
+    Measures how long a day's main.py takes to import in a fresh interpreter.
+
+    Args:
+        day (int): The day to measure.
+        repeat (int): Number of interpreters to start, the fastest is kept.
+
+    Returns:
+        float: The import time in seconds, including the modules it imports.
+
+    Raises:
+        RuntimeError: If the module fails to import.
+    """
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                                   cwd=runner.get_day_dir(day), capture_output=True,
+                                   text=True, check=False)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Day {day} failed to import: {completed.stderr.strip()}")
+        seconds = parse_import_time(completed.stderr, "main")
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+def measure_import_times(days:list, repeat:int = DEFAULT_REPEAT) -> dict:
+    """ Returns the import time in seconds of each requested day that has a solver"""
+    available_days = runner.find_days()
+    return {day: measure_import_time(day, repeat) for day in days if day in available_days}
+
+def find_import_regressions(import_times:dict, budget:float = DEFAULT_IMPORT_BUDGET) -> list:
+    """ Returns a description of each day that takes longer than budget seconds to import"""
+    return [f"Day {day} takes {seconds:.4f}s to import, budget is {budget:.4f}s"
+            for day, seconds in import_times.items() if seconds > budget]
+
+def load_baseline(path:str = BASELINE_FILE) -> dict:
+    """ Returns the saved baseline, or None if there is none"""
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+def save_baseline(entries:dict, path:str = BASELINE_FILE) -> None:
+    """ Saves benchmark entries as the new baseline"""
+    baseline = {
+        "created": time.time(),
+        "python": sys.version.split()[0],
+        "entries": entries,
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+def estimate_time(baseline:dict, day:int, part:int, path:str) -> float:
+    """
+    Estimates how long a part will take on an input from the baseline.
+
+    The time at the largest benchmarked scale is scaled by the part's growth
+    class, taking the input's size relative to the largest generated input.
+    Baselines saved before input sizes were recorded give the time at the
+    largest scale unchanged.
+
+    Args:
+        baseline (dict): The baseline loaded by load_baseline.
+        day (int): The day of the part.
+        part (int): The part.
+        path (str): The input file the part will run on.
+
+    Returns:
+        float: The expected seconds, None if the part is not in the baseline
+        or the input's size is needed but it is standard input or a pipe.
+    """
+    entry = baseline.get("entries", {}).get(f"{day}.{part}")
+    if entry is None:
+        return None
+    seconds = entry["times"][-1]
+    if "bytes" not in entry or not entry["bytes"][-1]:
+        return seconds
+    if not os.path.isfile(path):
+        return None
+    model = dict(GROWTH_MODELS)[entry["growth"]]
+    size = entry["sizes"][-1]
+    input_size = max(size * os.path.getsize(path) / entry["bytes"][-1], 2)
+    return seconds * model(input_size) / model(size)
+
+def find_regressions(entries:dict, baseline:dict, threshold:float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compares benchmark entries with a baseline.
+
+    Only entries benchmarked at the same scales as the baseline are compared.
+
+    Args:
+        entries (dict): The entries from run_benchmarks.
+        baseline (dict): The baseline loaded by load_baseline.
+        threshold (float): Allowed slow down as a fraction, 0.25 is 25% slower.
+
+    Returns:
+        list: A description of each regression found, empty if there are none.
+    """
+    regressions = []
+    baseline_entries = baseline.get("entries", {})
+    for key, entry in entries.items():
+        previous = baseline_entries.get(key)
+        if previous is None or previous["scales"] != entry["scales"]:
+            continue
+        day, part = key.split(".")
+        for scale, old_time, new_time in zip(entry["scales"], previous["times"], entry["times"]):
+            if new_time > old_time * (1 + threshold) and new_time - old_time > NOISE_FLOOR:
+                regressions.append(f"Day {day} part {part} at scale {scale}: "
+                                   f"{new_time:.4f}s vs {old_time:.4f}s baseline "
+                                   f"(+{(new_time / old_time - 1) * 100:.0f}%)")
+        if get_growth_rank(entry["growth"]) > get_growth_rank(previous["growth"]):
+            regressions.append(f"Day {day} part {part} growth is {entry['growth']}, "
+                               f"baseline was {previous['growth']}")
+    return regressions
+
+def format_entries(entries:dict) -> str:
+    """ Formats benchmark entries as a text table"""
+    lines = [f"{'Day':>3} {'Part':>4} {'Growth':>11}  Times (s) by scale"]
+    for key, entry in entries.items():
+        day, part = key.split(".")
+        times = ", ".join(f"{scale}: {seconds:.4f}"
+                          for scale, seconds in zip(entry["scales"], entry["times"]))
+        lines.append(f"{day:>3} {part:>4} {entry['growth']:>11}  {times}")
+    return "\n".join(lines)
+
+def format_import_times(import_times:dict) -> str:
+    """ Formats import times as a text table"""
+    lines = [f"{'Day':>3} {'Import (s)':>11}"]
+    for day, seconds in import_times.items():
+        lines.append(f"{day:>3} {seconds:>11.4f}")
+    return "\n".join(lines)
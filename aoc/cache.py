@@ -0,0 +1,150 @@
+"""
+On-disk cache of solver answers
+
+Answers are keyed by the day, the part, the SHA-256 of the input bytes and
+a hash of the solver source, so a cached answer is only reused for the
+same input and the same code. Each entry is a small JSON file whose
+modification time records when it was last used; when the cache grows past
+its size limit the least recently used entries are removed.
+"""
+import hashlib
+import json
+import os
+import time
+
+from aoc import runner
+
+CACHE_DIR = os.path.join(runner.REPO_ROOT, ".aoc_cache")
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+# Shared modules whose code can change a day's answer
+SHARED_SOLVER_FILES = (os.path.join(runner.REPO_ROOT, "aoc", "loader.py"),)
+
+def hash_file(path:str) -> str:
+    """ Returns the SHA-256 hex digest of a file's contents"""
+    with open(path, "rb") as data:
+        return hashlib.file_digest(data, "sha256").hexdigest()
+
+def hash_solver(day:int) -> str:
+    """
+    Returns a hash of the source code that solves a day.
+
+    Covers every Python file in the day's directory and the shared modules
+    the solvers use, so editing any of them invalidates the day's answers.
+    """
+    digest = hashlib.sha256()
+    day_dir = runner.get_day_dir(day)
+    paths = [os.path.join(day_dir, name) for name in sorted(os.listdir(day_dir))
+             if name.endswith(".py")]
+    for path in paths + list(SHARED_SOLVER_FILES):
+        digest.update(os.path.basename(path).encode())
+        digest.update(hash_file(path).encode())
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    A size-bounded least recently used cache of answers on disk.
+
+    Attributes:
+        directory (str): The directory holding the cache entries.
+        max_bytes (int): The total size of entries kept after eviction.
+        hits (int): Number of lookups that found an answer.
+        misses (int): Number of lookups that did not.
+        stores (int): Number of answers stored.
+        evictions (int): Number of entries removed to stay within max_bytes.
+    """
+    def __init__(self, directory:str = CACHE_DIR, max_bytes:int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._solver_hashes = {}
+
+    def get_key(self, day:int, part:int, file_name:str) -> str:
+        """ Returns the cache key for a part run against an input file"""
+        if day not in self._solver_hashes:
+            self._solver_hashes[day] = hash_solver(day)
+        text = f"{day}:{part}:{hash_file(file_name)}:{self._solver_hashes[day]}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _get_path(self, key:str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key:str) -> tuple:
+        """
+        Looks up an answer.
+
+        A hit marks the entry as recently used.
+
+        Args:
+            key (str): The key from get_key.
+
+        Returns:
+            tuple: (True, answer) on a hit, (False, None) on a miss.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return (False, None)
+        self.hits += 1
+        return (True, entry["answer"])
+
+    def put(self, key:str, day:int, part:int, answer) -> None:
+        """ Stores an answer, then evicts old entries if the cache is too big"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._get_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        entry = {"day": day, "part": part, "answer": answer, "created": time.time()}
+        with open(temp_path, "w", encoding="utf-8") as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(temp_path, path)
+        self.stores += 1
+        self.evict()
+
+    def evict(self) -> None:
+        """ Removes the least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(ENTRY_SUFFIX):
+                    stat = item.stat()
+                    entries.append((stat.st_mtime, item.path, stat.st_size))
+                    total += stat.st_size
+        entries.sort()
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """ Removes every entry from the cache"""
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(ENTRY_SUFFIX):
+                    os.remove(item.path)
+
+    def add_stats(self, counts:dict) -> None:
+        """ Adds counters from another ResultCache, e.g. one used in a worker process"""
+        self.hits += counts["hits"]
+        self.misses += counts["misses"]
+        self.stores += counts["stores"]
+        self.evictions += counts["evictions"]
+
+    def stats(self) -> dict:
+        """ Returns the hit, miss, store and eviction counters"""
+        return {"hits": self.hits, "misses": self.misses,
+                "stores": self.stores, "evictions": self.evictions}
@@ -0,0 +1,255 @@
+"""
+Warm solver daemon and its client
+
+The daemon listens on a Unix socket with every day module already imported
+(so numpy and the solvers are loaded once) and keeps recently read inputs
+in memory. Each request is one line of JSON and gets one line of JSON back:
+
+    {"day": 6, "part": 2, "file": "input.txt"}
+    -> {"day": 6, "part": 2, "answer": 1939, "wall_time": 0.14, "error": null, ...}
+
+    {"command": "stats"}    counters for the daemon
+    {"command": "stop"}     shut the daemon down
+
+A day module is imported again when its source file changes, so the
+daemon can stay up while the solvers are being edited.
+"""
+import collections
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import types
+
+from aoc import loader, runner
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"aoc-{os.getuid()}.sock")
+DEFAULT_MAX_INPUTS = 32
+ENCODING = "utf-8"
+
+class InputStore:
+    """
+    A least recently used store of the values returned by read_input and
+    by open_input.
+
+    Entries are keyed by day, path, size and modification time, so an input
+    file that changes is read again. Lazy iterators are materialised into
+    lists and a fresh iterator over the list is handed out on each use.
+    Streamed InputFiles, such as compressed inputs, are read into memory so
+    they can be used again; mapped ones stay mapped. The same object is
+    handed to every run, so solvers must leave their input as they found it.
+
+    Attributes:
+        max_inputs (int): The number of inputs kept in memory.
+        hits (int): Number of reads answered from memory.
+        misses (int): Number of reads that went to the file.
+    """
+    def __init__(self, max_inputs:int = DEFAULT_MAX_INPUTS) -> None:
+        self.max_inputs = max_inputs
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def wrap(self, day:int, module) -> None:
+        """ Replaces module.read_input and module.open_input with versions that use the store"""
+        read_input = getattr(module, "read_input", None)
+        if read_input is not None:
+            directory = os.path.dirname(module.__file__)
+
+            def resident_read_input(file_name, *args, **kwargs):
+                path = os.path.join(directory, file_name)
+                return self.get((day, "read_input", path, args, tuple(sorted(kwargs.items()))),
+                                path, lambda: read_input(file_name, *args, **kwargs))
+
+            module.read_input = resident_read_input
+        open_input = getattr(module, "open_input", None)
+        if open_input is not None:
+
+            def resident_open_input(file_name, directory = ""):
+                path = loader.get_input_path(file_name, directory)
+                if not os.path.isfile(path):
+                    # Standard input and pipes can only be read by the run they were given to
+                    return open_input(file_name, directory)
+                return self.get((day, "open_input", path), path,
+                                lambda: open_input(file_name, directory))
+
+            module.open_input = resident_open_input
+
+    def get(self, key:tuple, path:str, read):
+        """
+        Returns a stored input, calling read to load it on a miss.
+
+        Args:
+            key (tuple): Identifies the input, without the file's state.
+            path (str): The input file, whose size and modification time
+                are added to the key.
+            read (function): Loads the input.
+        """
+        stat = os.stat(path)
+        key = key + (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            is_iterator, value = self._entries[key]
+        else:
+            self.misses += 1
+            value = read()
+            is_iterator = isinstance(value, types.GeneratorType)
+            if is_iterator:
+                value = list(value)
+            elif isinstance(value, loader.InputFile) and value.streamed:
+                _ = value.bytes
+            self._entries[key] = (is_iterator, value)
+            while len(self._entries) > self.max_inputs:
+                self._entries.popitem(last=False)
+        return iter(value) if is_iterator else value
+
+    def forget_day(self, day:int) -> None:
+        """ Drops every input read for a day"""
+        for key in [key for key in self._entries if key[0] == day]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SolverDaemon(socketserver.UnixStreamServer):
+    """
+    A Unix socket server that runs day solvers in a warm process.
+
+    Requests are handled one at a time because the solvers keep state in
+    module globals.
+
+    Attributes:
+        inputs (InputStore): The inputs kept in memory.
+        requests (int): The number of solve requests handled.
+    """
+    def __init__(self, socket_path:str = DEFAULT_SOCKET,
+                 max_inputs:int = DEFAULT_MAX_INPUTS) -> None:
+        self.inputs = InputStore(max_inputs)
+        self.requests = 0
+        self._modules = {}
+        for day in runner.find_days():
+            self.load(day)
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, SolverRequestHandler)
+
+    def load(self, day:int):
+        """ Imports a day, or imports it again if its source has changed since it was loaded"""
+        path = os.path.join(runner.get_day_dir(day), runner.SOLVER_FILE_NAME)
+        mtime = os.stat(path).st_mtime_ns
+        if day in self._modules and self._modules[day][0] == mtime:
+            return self._modules[day][1]
+        runner.unload_day(day)
+        self.inputs.forget_day(day)
+        module = runner.load_day(day)
+        self.inputs.wrap(day, module)
+        self._modules[day] = (mtime, module)
+        return module
+
+    def solve(self, request:dict) -> dict:
+        """ Runs the part named in a request and returns the response"""
+        day = int(request["day"])
+        part = int(request["part"])
+        file_name = request.get("file") or runner.DEFAULT_FILE_NAME
+        self.requests += 1
+        try:
+            self.load(day)
+            path = runner.resolve_input(day, file_name)
+        except Exception as error:   # pylint: disable=broad-exception-caught
+            result = runner.PartResult(day, part, file_name)
+            result.error = f"{type(error).__name__}: {error}"
+            return result.as_dict()
+        hits = self.inputs.hits
+        response = runner.run_part(day, part, path, measure_memory=False).as_dict()
+        response["input_resident"] = self.inputs.hits > hits
+        return response
+
+    def stats(self) -> dict:
+        """ Returns counters describing the daemon"""
+        return {"requests": self.requests, "days": sorted(self._modules),
+                "resident_inputs": len(self.inputs), "input_hits": self.inputs.hits,
+                "input_misses": self.inputs.misses}
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+class SolverRequestHandler(socketserver.StreamRequestHandler):
+    """ Answers each line of JSON sent on a connection"""
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                command = request.get("command", "solve")
+                if command == "stop":
+                    response = {"stopping": True}
+                    threading.Thread(target=self.server.shutdown).start()
+                elif command == "stats":
+                    response = self.server.stats()
+                else:
+                    response = self.server.solve(request)
+            except Exception as error:   # pylint: disable=broad-exception-caught
+                response = {"error": f"{type(error).__name__}: {error}"}
+            self.wfile.write(json.dumps(response).encode(ENCODING) + b"\n")
+            self.wfile.flush()
+
+def remove_stale_socket(socket_path:str) -> None:
+    """
+    Removes a socket file left behind by a daemon that is no longer running.
+
+    Raises:
+        OSError: If a daemon is already listening on the socket.
+    """
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"A daemon is already listening on {socket_path}")
+
+def serve(socket_path:str = DEFAULT_SOCKET, max_inputs:int = DEFAULT_MAX_INPUTS) -> None:
+    """ Runs the daemon until it is sent a stop command or interrupted"""
+    with SolverDaemon(socket_path, max_inputs) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+def send(request:dict, socket_path:str = DEFAULT_SOCKET) -> dict:
+    """
+    Sends one request to the daemon and returns its response.
+
+    Raises:
+        ConnectionError: If no daemon is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError) as error:
+            raise ConnectionError(f"No daemon listening on {socket_path}, "
+                                  "start one with python -m aoc daemon") from error
+        client.sendall(json.dumps(request).encode(ENCODING) + b"\n")
+        with client.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+def solve(day:int, part:int, file_name:str = runner.DEFAULT_FILE_NAME,
+          socket_path:str = DEFAULT_SOCKET) -> dict:
+    """
+    Asks the daemon to solve a part.
+
+    A file name that exists relative to the current directory is sent as an
+    absolute path; anything else is looked up in the day's directory.
+    """
+    if os.path.exists(file_name):
+        file_name = os.path.abspath(file_name)
+    return send({"day": day, "part": part, "file": file_name}, socket_path)
@@ -0,0 +1,350 @@
+"""
+Generates valid puzzle inputs of any size for scale testing
+
+Each generator takes a scale and a random.Random instance and returns the
+text of an input file. The meaning of the scale depends on the day and is
+given in each generator's docstring. The same (day, scale, seed) always
+produces the same input so benchmark runs can be compared.
+"""
+import os
+import random
+
+from aoc import runner
+
+DEFAULT_SEED = 2024
+OUTPUT_DIR = os.path.join(runner.REPO_ROOT, "generated")
+XMAS_LETTERS = "XMAS"
+GUARD_ICON = "^"
+OBSTACLE = "#"
+EMPTY = "."
+ROBOT_COLS = 101
+ROBOT_ROWS = 103
+
+def generate_day_1(scale:int, rng:random.Random) -> str:
+    """
+    Location ID lists: scale is the number of pairs.
+
+    Values are drawn from a pool about the size of the list so that the
+    right list contains repeats of values in the left list.
+    """
+    low = 10000
+    high = low + scale
+    lines = []
+    for _ in range(scale):
+        lines.append(f"{rng.randint(low, high)}   {rng.randint(low, high)}")
+    return "\n".join(lines) + "\n"
+
+def generate_day_2(scale:int, rng:random.Random) -> str:
+    """
+    Reactor reports: scale is the number of reports.
+
+    About a third of the reports are safe, a third have one bad level and
+    the rest are random.
+    """
+    lines = []
+    for _ in range(scale):
+        length = rng.randint(5, 8)
+        kind = rng.randrange(3)
+        if kind == 2:
+            levels = [rng.randint(1, 99) for _ in range(length)]
+        else:
+            step = 1 if rng.random() < 0.5 else -1
+            levels = [rng.randint(20, 80)]
+            for _ in range(length - 1):
+                levels.append(levels[-1] + step * rng.randint(1, 3))
+            if kind == 1:
+                levels[rng.randrange(length)] += rng.choice((-5, 0, 4))
+        lines.append(" ".join(str(level) for level in levels))
+    return "\n".join(lines) + "\n"
+
+def generate_day_3(scale:int, rng:random.Random) -> str:
+    """
+    Corrupted memory: scale is the approximate size in bytes.
+
+    Valid mul instructions and do()/don't() toggles are mixed with corrupted
+    instructions and random punctuation.
+    """
+    noise = "()[]{}<>!@#$%^&*-+?/;:,'~ "
+    words = ("what()", "where()", "from()", "select()", "who()", "when()", "why()", "how()")
+    chunks = []
+    size = 0
+    while size < scale:
+        choice = rng.random()
+        if choice < 0.35:
+            chunk = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+        elif choice < 0.45:
+            chunk = rng.choice(("do()", "don't()"))
+        elif choice < 0.6:
+            chunk = rng.choice((f"mul({rng.randint(1, 999)}, {rng.randint(1, 999)})",
+                                f"mul({rng.randint(1, 9999)},{rng.randint(1, 99)}]",
+                                f"mul[{rng.randint(1, 999)},{rng.randint(1, 999)})",
+                                "mul(,)", "do_not()", "don't"))
+        elif choice < 0.75:
+            chunk = rng.choice(words)
+        else:
+            chunk = "".join(rng.choice(noise) for _ in range(rng.randint(1, 4)))
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks) + "\n"
+
+def generate_day_4(scale:int, rng:random.Random) -> str:
+    """
+    Word search: scale is the side of the square grid.
+
+    Letters are drawn from XMAS so the word and the X-MAS cross both occur.
+    """
+    lines = []
+    for _ in range(scale):
+        lines.append("".join(rng.choice(XMAS_LETTERS) for _ in range(scale)))
+    return "\n".join(lines) + "\n"
+
+def generate_day_5(scale:int, rng:random.Random) -> str:
+    """
+    Page ordering rules and updates: scale is the number of updates.
+
+    Pages 10-99 are put in a random order and a rule is written for every
+    pair, giving 4005 rules. Roughly half the updates are in order.
+    """
+    pages = list(range(10, 100))
+    rng.shuffle(pages)
+    rules = []
+    for i, before in enumerate(pages):
+        for after in pages[i + 1:]:
+            rules.append(f"{before}|{after}")
+    rng.shuffle(rules)
+    rank = {page: i for i, page in enumerate(pages)}
+    updates = []
+    for _ in range(scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=rank.get)
+        updates.append(",".join(str(page) for page in update))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+def guard_leaves_map(grid:list, y:int, x:int) -> bool:
+    """ Returns True if a guard starting at (y, x) facing up walks off the map"""
+    rows = len(grid)
+    cols = len(grid[0])
+    dy, dx = -1, 0
+    seen = set()
+    while True:
+        if (y, x, dy, dx) in seen:
+            return False
+        seen.add((y, x, dy, dx))
+        new_y, new_x = y + dy, x + dx
+        if not (0 <= new_y < rows and 0 <= new_x < cols):
+            return True
+        if grid[new_y][new_x] == OBSTACLE:
+            dy, dx = dx, -dy
+        else:
+            y, x = new_y, new_x
+
+def generate_day_6(scale:int, rng:random.Random) -> str:
+    """
+    Guard patrol map: scale is the side of the square map.
+
+    Obstacles are placed so the guard spirals out from the centre of the
+    map, visiting about half of the cells before leaving, as the puzzle
+    guard does. About 5% of the cells off that route are also obstacles.
+    """
+    grid = [[EMPTY] * scale for _ in range(scale)]
+    y = x = scale // 2
+    start = (y, x)
+    route = {start}
+    dy, dx = -1, 0
+    length = 2
+    legs = 0
+    while True:
+        for _ in range(length):
+            y, x = y + dy, x + dx
+            route.add((y, x))
+        obstacle_y, obstacle_x = y + dy, x + dx
+        if not (0 <= obstacle_y < scale and 0 <= obstacle_x < scale):
+            break
+        if not (0 <= obstacle_y + dy * 2 < scale and 0 <= obstacle_x + dx * 2 < scale):
+            break
+        grid[obstacle_y][obstacle_x] = OBSTACLE
+        route.add((obstacle_y, obstacle_x))
+        dy, dx = dx, -dy
+        legs += 1
+        if legs % 2 == 0:
+            length += 2
+    while 0 <= y < scale and 0 <= x < scale:
+        route.add((y, x))
+        y, x = y + dy, x + dx
+    for row in range(scale):
+        for col in range(scale):
+            if (row, col) not in route and rng.random() < 0.05:
+                grid[row][col] = OBSTACLE
+    grid[start[0]][start[1]] = GUARD_ICON
+    if not guard_leaves_map(grid, start[0], start[1]):
+        raise ValueError(f"Guard does not leave the generated map of size {scale}")
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+def generate_day_7(scale:int, rng:random.Random) -> str:
+    """
+    Calibration equations: scale is the number of equations.
+
+    Equations have 2-11 operands like the puzzle input. Two thirds are built
+    from real operators (some needing concatenation), the rest are random.
+    """
+    lines = []
+    for _ in range(scale):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(2, 11))]
+        if rng.random() < 2 / 3:
+            operators = ("+", "*", "||") if rng.random() < 0.5 else ("+", "*")
+            answer = numbers[0]
+            for number in numbers[1:]:
+                operator = rng.choice(operators)
+                if operator == "+":
+                    answer += number
+                elif operator == "*":
+                    answer *= number
+                else:
+                    answer = int(f"{answer}{number}")
+        else:
+            answer = rng.randint(1, 10 ** rng.randint(3, 14))
+        lines.append(f"{answer}: " + " ".join(str(number) for number in numbers))
+    return "\n".join(lines) + "\n"
+
+def generate_day_9(scale:int, rng:random.Random) -> str:
+    """
+    Disk map: scale is the number of files on the disk.
+
+    Files are 1-9 blocks long and are separated by 0-9 free blocks.
+    """
+    digits = []
+    for i in range(scale):
+        digits.append(str(rng.randint(1, 9)))
+        if i < scale - 1:
+            digits.append(str(rng.randint(0, 9)))
+    return "".join(digits) + "\n"
+
+def generate_day_10(scale:int, rng:random.Random) -> str:
+    """
+    Topographic map: scale is the side of the square map.
+
+    Heights rise in diagonal bands so there are many hiking trails, with 10%
+    of cells replaced by random heights to break them up.
+    """
+    offset = rng.randrange(10)
+    lines = []
+    for y in range(scale):
+        row = []
+        for x in range(scale):
+            if rng.random() < 0.1:
+                row.append(str(rng.randrange(10)))
+            else:
+                row.append(str((x + y + offset) % 10))
+        lines.append("".join(row))
+    return "\n".join(lines) + "\n"
+
+def generate_day_11(scale:int, rng:random.Random) -> str:
+    """ Stones: scale is the number of stones"""
+    stones = [str(rng.choice((0, rng.randint(1, 9999999)))) for _ in range(scale)]
+    return " ".join(stones) + "\n"
+
+def generate_day_13(scale:int, rng:random.Random) -> str:
+    """
+    Claw machines: scale is the number of machines.
+
+    About half the prizes can be reached with whole numbers of presses.
+    Buttons are never parallel so every system of equations can be solved.
+    """
+    machines = []
+    for _ in range(scale):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by != ay * bx:
+                break
+        if rng.random() < 0.5:
+            presses_a = rng.randint(1, 100)
+            presses_b = rng.randint(1, 100)
+            px = ax * presses_a + bx * presses_b
+            py = ay * presses_a + by * presses_b
+        else:
+            px = rng.randint(1000, 20000)
+            py = rng.randint(1000, 20000)
+        machines.append(f"Button A: X+{ax}, Y+{ay}\n"
+                        f"Button B: X+{bx}, Y+{by}\n"
+                        f"Prize: X={px}, Y={py}\n")
+    return "\n".join(machines)
+
+def generate_day_14(scale:int, rng:random.Random) -> str:
+    """ Robots on the full size 101 x 103 room: scale is the number of robots"""
+    lines = []
+    for _ in range(scale):
+        lines.append(f"p={rng.randrange(ROBOT_COLS)},{rng.randrange(ROBOT_ROWS)} "
+                     f"v={rng.randint(-99, 99)},{rng.randint(-99, 99)}")
+    return "\n".join(lines) + "\n"
+
+GENERATORS = {
+    1: generate_day_1,
+    2: generate_day_2,
+    3: generate_day_3,
+    4: generate_day_4,
+    5: generate_day_5,
+    6: generate_day_6,
+    7: generate_day_7,
+    9: generate_day_9,
+    10: generate_day_10,
+    11: generate_day_11,
+    13: generate_day_13,
+    14: generate_day_14,
+}
+
+def generate(day:int, scale:int, seed:int = DEFAULT_SEED) -> str:
+    """
+    Generates the text of an input file for a day.
+
+    Args:
+        day (int): The day to generate input for.
+        scale (int): The size of the input, see the day's generator.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        str: The generated input.
+
+    Raises:
+        ValueError: If there is no generator for the day or scale is not positive.
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+    if scale < 1:
+        raise ValueError(f"Scale must be positive, got {scale}")
+    return GENERATORS[day](scale, random.Random(f"{day}:{scale}:{seed}"))
+
+def get_output_path(day:int, scale:int, seed:int = DEFAULT_SEED,
+                    output_dir:str = OUTPUT_DIR) -> str:
+    """ Returns the path a generated input is written to"""
+    return os.path.join(output_dir, runner.DAY_DIR_FORMAT.format(day),
+                        f"scale_{scale}_seed_{seed}.txt")
+
+def write_input(day:int, scale:int, seed:int = DEFAULT_SEED,
+                output_dir:str = OUTPUT_DIR, overwrite:bool = False) -> str:
+    """
+    Generates an input and writes it to the output directory.
+
+    Inputs that have already been generated are reused unless overwrite is set,
+    since generation is deterministic.
+
+    Args:
+        day (int): The day to generate input for.
+        scale (int): The size of the input, see the day's generator.
+        seed (int): Seed for the random number generator.
+        output_dir (str): Directory that holds one sub directory per day.
+        overwrite (bool): Regenerate the file even if it already exists.
+
+    Returns:
+        str: The path of the generated file.
+    """
+    path = get_output_path(day, scale, seed, output_dir)
+    if os.path.isfile(path) and not overwrite:
+        return path
+    text = generate(day, scale, seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as output:
+        output.write(text)
+    os.replace(temp_path, path)
+    return path
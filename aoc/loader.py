@@ -0,0 +1,498 @@
+"""
+Memory-mapped input loader shared by the days
+
+open_input maps the input file read-only and offers views of it that avoid
+building a list of str lines:
+
+    data.bytes          the whole input as a bytes-like object
+    data.text()         the whole input as a str
+    data.memoryview()   a zero-copy memoryview of the input
+    data.lines()        a lazy iterator of lines as bytes, newline removed
+    data.blocks()       a lazy iterator of blocks of whole lines as bytes
+    data.chunks()       a lazy iterator of fixed-size chunks as bytes
+    data.int_columns(n) n arrays of integers, one per whitespace separated column
+    data.int_rows()     a lazy iterator of the integers on each line
+    data.grid()         a fixed-width grid indexed as grid[y][x], giving byte values
+    data.grid_layout()  the columns, row stride and rows of a fixed-width grid
+
+The file name "-" reads standard input, and named pipes can be given as
+paths. Both are streamed: lines() hands out each line as it arrives, while
+a copy is written to a temporary file so that later opens of the same
+input (part 2 after part 1) read the copy. Gzip and zstd compressed inputs
+are recognised by their magic bytes and decoded on the fly; zstd needs
+Python 3.14 or the zstandard package. Streamed inputs only hold the whole
+input in memory if .bytes or one of the views built on it is used.
+
+Every day imports this module, so it avoids importing re, gzip and
+tempfile until they are needed.
+"""
+import atexit
+import io
+import mmap
+import os
+import sys
+from array import array
+
+NEWLINE = b"\n"
+INT_PATTERN = rb"-?\d+"
+INT_TYPECODE = "q"
+STDIN_NAME = "-"
+ENCODING = "utf-8"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+MAGIC_SIZE = 4
+CHUNK_SIZE = 1 << 16
+
+class Grid:
+    """
+    A rectangular grid of single byte cells over an input buffer.
+
+    Rows are memoryview slices of the buffer, so grid[y][x] returns the byte
+    value of a cell (e.g. ord("#")) without creating a str per cell. If the
+    grid is writable, cells can be assigned byte values.
+
+    Attributes:
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+    """
+    def __init__(self, buffer, cols:int, stride:int, rows:int) -> None:
+        self._buffer = buffer
+        self._stride = stride
+        self.rows = rows
+        self.cols = cols
+        view = memoryview(buffer)
+        self._rows = [view[y * stride: y * stride + cols] for y in range(rows)]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, y):
+        return self._rows[y]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def line(self, y:int, x:int, step_y:int, step_x:int) -> bytes:
+        """
+        Returns the cells from (y, x) onwards in steps of (step_y, step_x),
+        up to the edge of the grid.
+
+        The cells are taken with one strided slice of the buffer, so rows,
+        columns and diagonals are read without a Python loop.
+
+        Args:
+            y (int): The row of the first cell.
+            x (int): The column of the first cell.
+            step_y (int): The change in row from one cell to the next.
+            step_x (int): The change in column from one cell to the next.
+
+        Returns:
+            bytes: The values of the cells along the line.
+        """
+        count = self.rows + self.cols
+        for position, step, limit in ((y, step_y, self.rows), (x, step_x, self.cols)):
+            if step > 0:
+                count = min(count, (limit - 1 - position) // step + 1)
+            elif step < 0:
+                count = min(count, position // -step + 1)
+        if count <= 0 or not (0 <= y < self.rows and 0 <= x < self.cols):
+            return b""
+        start = y * self._stride + x
+        step = step_y * self._stride + step_x
+        end = start + step * count
+        return bytes(self._buffer[start:end if end >= 0 else None:step])
+
+    def array(self):
+        """
+        Returns the cells as a rows x cols numpy array of uint8.
+
+        The array is a read-only view of the buffer, so no cells are copied.
+        Needs numpy, which is only imported when this is called.
+        """
+        import numpy as np   # pylint: disable=import-outside-toplevel
+        cells = np.frombuffer(self._buffer, dtype=np.uint8)
+        return np.lib.stride_tricks.as_strided(cells, (self.rows, self.cols),
+                                               (self._stride, 1), writeable=False)
+
+    def find(self, value:int) -> tuple:
+        """
+        Finds the first cell holding a byte value.
+
+        Args:
+            value (int): The byte value to look for, e.g. ord("^").
+
+        Returns:
+            tuple: The (y, x) position of the cell, or None if not found.
+        """
+        position = self._buffer.find(bytes((value,)))
+        while position >= 0:
+            y, x = divmod(position, self._stride)
+            if x < self.cols and y < self.rows:
+                return (y, x)
+            position = self._buffer.find(bytes((value,)), position + 1)
+        return None
+
+class StreamCopy(io.RawIOBase):
+    """
+    A readable stream that copies everything read from a source to a file.
+
+    Standard input and pipes can only be read once; the copy lets the same
+    input be opened again after the first reader has streamed through it.
+
+    Attributes:
+        path (str): The path of the copy.
+    """
+    def __init__(self, source) -> None:
+        import tempfile   # pylint: disable=import-outside-toplevel
+        super().__init__()
+        self._source = source
+        handle, self.path = tempfile.mkstemp(prefix="aoc-input-")
+        self._copy = os.fdopen(handle, "wb")
+        atexit.register(os.remove, self.path)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._source.read1(len(buffer))
+        buffer[:len(data)] = data
+        self._copy.write(data)
+        return len(data)
+
+    def finish(self) -> str:
+        """ Copies whatever has not been read yet and returns the path of the copy"""
+        if not self._copy.closed:
+            while self.readinto(bytearray(CHUNK_SIZE)):
+                pass
+            self._copy.close()
+        return self.path
+
+# Standard input and pipes that have been opened, by name
+_stream_copies = {}
+
+def is_stream(path:str) -> bool:
+    """ Returns True if the input is standard input or a pipe, which can only be read once"""
+    return path == STDIN_NAME or (os.path.exists(path) and not os.path.isfile(path))
+
+def spool_input(path:str) -> str:
+    """
+    Returns the path of a regular file holding an input.
+
+    Standard input and pipes are copied to a temporary file, which this
+    process also reads if it opens them again, so other processes can be
+    handed the same input. Any other path is returned unchanged.
+    """
+    if not is_stream(path):
+        return path
+    if path not in _stream_copies:
+        source = sys.stdin.buffer if path == STDIN_NAME else open(path, "rb")   # pylint: disable=consider-using-with
+        _stream_copies[path] = StreamCopy(source)
+    return _stream_copies[path].finish()
+
+def decode_stream(stream):
+    """
+    Wraps a buffered binary stream in a decompressor if it starts with the
+    magic bytes of a gzip or zstd stream.
+
+    Raises:
+        ImportError: If the input is zstd compressed and no zstd decoder is available.
+    """
+    magic = stream.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    # pylint: disable=import-outside-toplevel
+    if magic.startswith(GZIP_MAGIC):
+        import gzip
+        return gzip.GzipFile(fileobj=stream)
+    if magic == ZSTD_MAGIC:
+        try:
+            from compression import zstd
+            return zstd.ZstdFile(stream)
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("zstd input needs Python 3.14 or the zstandard package") from error
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream))
+    return stream
+
+class InputFile:
+    """
+    An input file mapped into memory, or streamed if it is standard input,
+    a pipe or compressed.
+
+    Attributes:
+        path (str): The path of the input file, "-" for standard input.
+        bytes: The contents of the file, an mmap or a bytes object.
+    """
+    def __init__(self, path:str) -> None:
+        self.path = path
+        self._bytes = None
+        self._stream = None
+        # The compressed file under _stream, which the decompressor does not close
+        self._compressed = None
+        if is_stream(path):
+            if path in _stream_copies:
+                path = _stream_copies[path].finish()
+            else:
+                source = sys.stdin.buffer if path == STDIN_NAME else open(path, "rb")
+                _stream_copies[path] = StreamCopy(source)
+                self._stream = decode_stream(io.BufferedReader(_stream_copies[path]))
+                return
+        input_data = open(path, "rb")   # pylint: disable=consider-using-with
+        if input_data.peek(MAGIC_SIZE)[:MAGIC_SIZE].startswith((GZIP_MAGIC, ZSTD_MAGIC)):
+            self._stream = decode_stream(input_data)
+            self._compressed = input_data
+            return
+        with input_data:
+            if os.fstat(input_data.fileno()).st_size > 0:
+                self._bytes = mmap.mmap(input_data.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._bytes = input_data.read()
+
+    @property
+    def bytes(self):
+        """ The whole input, read from the stream the first time it is used"""
+        if self._bytes is None:
+            stream = self._stream
+            self._stream = None
+            try:
+                self._bytes = stream.read()
+            finally:
+                self._close_stream(stream)
+        return self._bytes
+
+    def _close_stream(self, stream) -> None:
+        """ Closes a stream that has been handed out, and the compressed file under it"""
+        if self._compressed is not None:
+            stream.close()
+            self._compressed.close()
+            self._compressed = None
+
+    def __len__(self) -> int:
+        return len(self.bytes)
+
+    @property
+    def streamed(self) -> bool:
+        """ True if the input is read as a stream rather than mapped or held in memory"""
+        return self._stream is not None
+
+    def text(self) -> str:
+        """ Returns the whole input decoded as UTF-8"""
+        return self.bytes[:].decode(ENCODING)
+
+    def memoryview(self) -> memoryview:
+        """ Returns a zero-copy view of the whole input"""
+        return memoryview(self.bytes)
+
+    def lines(self):
+        """
+        Lazily yields each line of the input as bytes without its line ending.
+
+        A trailing newline does not produce an empty last line. A streamed
+        input is read one line at a time, so memory use does not grow with
+        the size of the input.
+        """
+        if self._stream is not None:
+            stream = self._stream
+            self._stream = None
+            self._bytes = b""
+            try:
+                for line in stream:
+                    yield line.rstrip(b"\r\n")
+            finally:
+                self._close_stream(stream)
+            return
+        data = self.bytes
+        size = len(data)
+        start = 0
+        while start < size:
+            end = data.find(NEWLINE, start)
+            if end < 0:
+                end = size
+            line = data[start:end]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            yield line
+            start = end + 1
+
+    def blocks(self, size:int = CHUNK_SIZE):
+        """
+        Lazily yields the input in blocks of whole lines.
+
+        Each block is about size bytes and ends with a line break, except
+        perhaps the last. Working on blocks rather than lines moves most of
+        the per-line work into C.
+
+        Args:
+            size (int): The approximate size of each block in bytes.
+        """
+        if self._stream is not None:
+            stream = self._stream
+            self._stream = None
+            self._bytes = b""
+            read = getattr(stream, "read1", stream.read)
+            rest = b""
+            try:
+                data = read(size)
+                while data:
+                    data = rest + data
+                    end = data.rfind(NEWLINE) + 1
+                    rest = data[end:]
+                    if end > 0:
+                        yield data[:end]
+                    data = read(size)
+            finally:
+                self._close_stream(stream)
+            if rest:
+                yield rest
+            return
+        data = self.bytes
+        total = len(data)
+        start = 0
+        while start < total:
+            end = data.find(NEWLINE, min(start + size, total))
+            end = total if end < 0 else end + 1
+            yield data[start:end]
+            start = end
+
+    def chunks(self, size:int = CHUNK_SIZE):
+        """
+        Lazily yields the input in chunks of size bytes, the last perhaps shorter.
+
+        Chunks ignore line breaks, so they suit inputs with very long lines
+        or none at all. Only one chunk is held in memory at a time.
+
+        Args:
+            size (int): The size of each chunk in bytes.
+        """
+        if self._stream is not None:
+            stream = self._stream
+            self._stream = None
+            self._bytes = b""
+            try:
+                data = stream.read(size)
+                while data:
+                    yield data
+                    data = stream.read(size)
+            finally:
+                self._close_stream(stream)
+            return
+        data = self.bytes
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    def int_columns(self, count:int) -> tuple:
+        """
+        Parses whitespace separated integer columns straight from the bytes.
+
+        Every non-blank line must hold count integers; blank lines are
+        skipped. The input is split a block at a time, and values are stored
+        in arrays of 64 bit integers, which take 8 bytes each rather than a
+        Python int object.
+
+        Args:
+            count (int): The number of columns on each line.
+
+        Returns:
+            tuple: One array per column.
+
+        Raises:
+            ValueError: If the number of values is not a multiple of count.
+        """
+        columns = tuple(array(INT_TYPECODE) for _ in range(count))
+        for block in self.blocks():
+            values = block.split()
+            if len(values) % count:
+                raise ValueError(f"{self.path} does not have {count} integers on every line")
+            for index, column in enumerate(columns):
+                column.extend(map(int, values[index::count]))
+        return columns
+
+    def int_rows(self):
+        """ Lazily yields a list of the integers found on each line, e.g. p=3,-4 gives [3, -4]"""
+        import re   # pylint: disable=import-outside-toplevel
+        find_ints = re.compile(INT_PATTERN).findall
+        for line in self.lines():
+            yield [int(value) for value in find_ints(line)]
+
+    def grid_layout(self) -> tuple:
+        """
+        Works out the shape of a fixed-width input without building a grid.
+
+        Row y starts at offset y * stride, so a band of rows can be viewed
+        without touching the rest of the input.
+
+        Returns:
+            tuple: The number of columns, the stride in bytes from one row
+            to the next and the number of rows.
+
+        Raises:
+            ValueError: If the lines are not all the same length.
+        """
+        data = self.bytes
+        size = len(data)
+        while size > 0 and data[size - 1] in b"\r\n":
+            size -= 1
+        cols = data.find(NEWLINE, 0, size)
+        if cols < 0:
+            cols = size
+        line_end = NEWLINE
+        if cols > 0 and data[cols - 1:cols] == b"\r":
+            cols -= 1
+            line_end = b"\r\n"
+        stride = cols + len(line_end)
+        rows = (size + len(line_end)) // stride if size > 0 else 0
+        valid = size == 0 or rows * stride - len(line_end) == size
+        for y in range(1, rows):
+            if not valid:
+                break
+            valid = data[y * stride - len(line_end): y * stride] == line_end
+        if not valid:
+            raise ValueError(f"{self.path} is not a fixed width grid of width {cols}")
+        return cols, stride, rows
+
+    def grid(self, writable:bool = False) -> Grid:
+        """
+        Returns a grid view of a fixed-width input.
+
+        Every line must have the same length. A read-only grid shares the
+        mapped file; a writable grid is backed by a single bytearray copy.
+
+        Args:
+            writable (bool): Allow cells of the grid to be changed.
+
+        Returns:
+            Grid: The grid view.
+
+        Raises:
+            ValueError: If the lines are not all the same length.
+        """
+        cols, stride, rows = self.grid_layout()
+        buffer = bytearray(self.bytes) if writable else self.bytes
+        return Grid(buffer, cols, stride, rows)
+
+def open_input(file_name:str, directory:str = "") -> InputFile:
+    """
+    Opens an input file as an InputFile.
+
+    A file name that is not in directory but exists relative to the
+    current directory is opened from there.
+
+    Args:
+        file_name (str): Name of the input file, relative to directory, a
+            path, or "-" for standard input.
+        directory (str): Directory of the day's code.
+
+    Returns:
+        InputFile: The mapped or streamed input.
+    """
+    return InputFile(get_input_path(file_name, directory))
+
+def get_input_path(file_name:str, directory:str = "") -> str:
+    """ Returns the path open_input reads a file name from, "-" for standard input"""
+    if file_name == STDIN_NAME:
+        return STDIN_NAME
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path) and os.path.exists(file_name):
+        path = file_name
+    return path
@@ -0,0 +1,53 @@
+"""
+Process pools for the day solvers
+
+The runner imports each day from its NNday/main.py file under a name such
+as aoc_day_05, which is only registered in sys.modules by runner.load_day.
+A worker started with the spawn or forkserver method begins with a fresh
+interpreter, so it cannot unpickle the day's functions or objects by that
+name. Pools made here start each worker by importing the day's file under
+the same name before anything from the day is unpickled.
+"""
+import importlib.util
+import pickle
+import sys
+
+def create_pool(module, jobs:int, initializer:str = None,
+                initargs:tuple = ()) -> "concurrent.futures.ProcessPoolExecutor":
+    """
+    Returns a process pool whose workers can run a day's functions.
+
+    Each worker imports the day module before it runs anything, so the pool
+    works under the fork, spawn and forkserver start methods alike.
+    concurrent.futures is imported here because loading multiprocessing
+    would take most of a day's import budget.
+
+    Args:
+        module (module): The day module, as returned by runner.load_day or
+            run as a script.
+        jobs (int): The number of worker processes.
+        initializer (str): Name of a function in the day module to run in
+            each worker once the module is imported, or None.
+        initargs (tuple): Arguments for the initializer. They are pickled
+            here and unpickled after the worker has imported the day.
+    """
+    import concurrent.futures   # pylint: disable=import-outside-toplevel
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=start_worker,
+        initargs=(module.__name__, module.__file__, initializer, pickle.dumps(initargs)))
+
+def start_worker(module_name:str, path:str, initializer:str, initargs:bytes) -> None:
+    """
+    Imports a day in a worker process, then runs its initializer.
+
+    A worker that already has the module, because it was forked or because
+    the day is the __main__ script spawn imports again itself, uses it.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    if initializer is not None:
+        getattr(module, initializer)(*pickle.loads(initargs))
@@ -0,0 +1,221 @@
+"""
+Opt-in profiling of the hot functions in each day
+
+A day declares the functions worth profiling in a module level
+HOT_FUNCTIONS tuple. When the AOC_PROFILE environment variable names an
+output file (or the runner is given --profile), the runner replaces each of
+those functions with a wrapper that runs it under cProfile and tracemalloc.
+When profiling is off nothing is wrapped, so the solvers run unchanged.
+
+At exit two files are written:
+    <AOC_PROFILE>             collapsed stacks for flamegraph.pl / speedscope,
+                              weighted by time in microseconds
+    <AOC_PROFILE>.stats.json  per-function call counts, total and cumulative
+                              time, and allocations for each hot function
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import pstats
+import tracemalloc
+
+PROFILE_ENV = "AOC_PROFILE"
+HOT_FUNCTIONS_ATTRIBUTE = "HOT_FUNCTIONS"
+STATS_SUFFIX = ".stats.json"
+MICROSECONDS = 1_000_000
+
+class Profiler:
+    """
+    Collects profiles for every call to an instrumented hot function.
+
+    A single cProfile.Profile is enabled while any hot function is running,
+    so recursive and nested hot calls are recorded once, under the
+    outermost call.
+
+    Attributes:
+        output_path (str): The collapsed stack file to write.
+        profile (cProfile.Profile): The profile shared by all hot functions.
+        allocations (dict): For each hot function, a dict of outermost calls,
+            net bytes still allocated after the calls and the peak bytes
+            allocated during a single call.
+    """
+    def __init__(self, output_path:str) -> None:
+        self.output_path = output_path
+        self.profile = cProfile.Profile()
+        self.allocations = {}
+        self._depth = 0
+
+    def wrap(self, label:str, function):
+        """ Returns function wrapped so that its outermost calls are profiled"""
+        allocation = self.allocations.setdefault(label, {"calls": 0, "net_bytes": 0,
+                                                         "peak_bytes": 0})
+        @functools.wraps(function)
+        def profiled_call(*args, **kwargs):
+            if self._depth > 0:
+                return function(*args, **kwargs)
+            self._depth += 1
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            self.profile.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.profile.disable()
+                current, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._depth -= 1
+                allocation["calls"] += 1
+                allocation["net_bytes"] += current - start_memory
+                allocation["peak_bytes"] = max(allocation["peak_bytes"], peak - start_memory)
+        profiled_call.profiled = True
+        return profiled_call
+
+    def get_stats(self):
+        """ Returns the collected profile as pstats.Stats, None if nothing ran"""
+        try:
+            return pstats.Stats(self.profile)
+        except TypeError:
+            return None
+
+    def write(self) -> None:
+        """ Writes the collapsed stack file and the statistics file"""
+        stats = self.get_stats()
+        entries = {} if stats is None else stats.stats
+        with open(self.output_path, "w", encoding="utf-8") as output:
+            for stack, weight in sorted(collapse_stacks(entries).items()):
+                output.write(f"{stack} {weight}\n")
+        functions = []
+        for key, (primitive_calls, calls, total_time, cumulative_time, _) in entries.items():
+            if is_profiler_call(key):
+                continue
+            functions.append({
+                "function": get_label(key),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_time": total_time,
+                "cumulative_time": cumulative_time,
+            })
+        functions.sort(key=lambda entry: entry["cumulative_time"], reverse=True)
+        report = {"hot_functions": self.allocations, "functions": functions}
+        with open(self.output_path + STATS_SUFFIX, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+
+_profiler = None
+
+def get_output_path() -> str:
+    """ Returns the profile output file, None if profiling is off"""
+    return os.environ.get(PROFILE_ENV) or None
+
+def get_profiler() -> Profiler:
+    """ Returns the process wide profiler, creating it on first use"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(os.path.abspath(get_output_path()))
+        atexit.register(_profiler.write)
+    return _profiler
+
+def instrument(module) -> None:
+    """
+    Wraps the hot functions of a day module if profiling is on.
+
+    Functions are replaced in the module's namespace, so calls made from
+    inside the module, including recursive calls, go through the wrapper.
+    A dotted name such as "RuleIndex.is_valid" replaces a method on its class.
+
+    Args:
+        module (module): A day module, optionally defining HOT_FUNCTIONS.
+    """
+    if get_output_path() is None:
+        return
+    hot_functions = getattr(module, HOT_FUNCTIONS_ATTRIBUTE, ())
+    if not hot_functions:
+        return
+    profiler = get_profiler()
+    day_name = os.path.basename(os.path.dirname(module.__file__))
+    for name in hot_functions:
+        owner = module
+        *owner_names, attribute = name.split(".")
+        for owner_name in owner_names:
+            owner = getattr(owner, owner_name)
+        function = getattr(owner, attribute)
+        if getattr(function, "profiled", False):
+            continue
+        setattr(owner, attribute, profiler.wrap(f"{day_name}:{name}", function))
+
+def get_label(key:tuple) -> str:
+    """
+    Returns a flamegraph frame name for a pstats function key.
+
+    Day solvers are named after their directory, e.g. 06day:is_loop, and
+    built in functions keep the name cProfile gives them.
+    """
+    file_name, line, name = key
+    if file_name == "~":
+        label = name
+    else:
+        directory = os.path.basename(os.path.dirname(file_name))
+        module = os.path.splitext(os.path.basename(file_name))[0]
+        prefix = directory if module == "main" else module
+        label = f"{prefix}:{name}:{line}" if name == "<lambda>" else f"{prefix}:{name}"
+    return label.replace(";", ",").replace(" ", "_")
+
+def is_wrapper(key:tuple) -> bool:
+    """ Returns True if the pstats key is a profiling wrapper, which is left out of stacks"""
+    return key[0] == __file__ and key[2] == "profiled_call"
+
+def is_profiler_call(key:tuple) -> bool:
+    """ Returns True if the pstats key is the call that stops the profiler"""
+    return key[0] == "~" and "_lsprof.Profiler" in key[2]
+
+def collapse_stacks(entries:dict) -> dict:
+    """
+    Rebuilds weighted call stacks from cProfile's caller graph.
+
+    cProfile records only caller to callee edges, so time is pushed down
+    from each root in proportion to the cumulative time of each edge. This
+    is exact for call trees and a good estimate where a function has
+    several callers. A root is a function called only by the profiling
+    wrapper or by itself; recursive calls are folded into the outer frame.
+
+    Args:
+        entries (dict): The stats dictionary of a pstats.Stats object.
+
+    Returns:
+        dict: Maps a semicolon separated stack to its self time in microseconds.
+    """
+    callees = {}
+    roots = []
+    for key, (_, _, _, _, callers) in entries.items():
+        if all(caller == key or is_wrapper(caller) for caller in callers):
+            roots.append(key)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((key, edge[3]))
+    stacks = {}
+
+    def visit(key, path, share, visiting):
+        total_time = entries[key][2]
+        if not is_wrapper(key):
+            path = path + (get_label(key),)
+            weight = int(round(total_time * share * MICROSECONDS))
+            if weight > 0:
+                stack = ";".join(path)
+                stacks[stack] = stacks.get(stack, 0) + weight
+        for callee, edge_time in callees.get(key, ()):
+            callee_cumulative = entries[callee][3]
+            if callee in visiting or callee_cumulative <= 0:
+                continue
+            visiting.add(callee)
+            visit(callee, path, share * edge_time / callee_cumulative, visiting)
+            visiting.discard(callee)
+
+    for root in roots:
+        if not is_profiler_call(root):
+            visit(root, (), 1.0, {root})
+    return stacks
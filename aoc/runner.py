@@ -0,0 +1,436 @@
+"""
+Runs the solver for each day inside a single Python process
+
+Every NNday/main.py exposes part_1(file_name) and, where the puzzle has
+been solved, part_2(file_name). The runner imports each of those scripts
+as a module, runs the parts one at a time, or across a pool of worker
+processes, and records wall time, CPU time and peak memory for each part.
+"""
+import concurrent.futures
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+from aoc import loader, profiling
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_DIR_FORMAT = "{0:02d}day"
+SOLVER_FILE_NAME = "main.py"
+DEFAULT_FILE_NAME = "input.txt"
+TEST_FILE_NAMES = ("test_input.txt", "input_test.txt")
+PARTS = (1, 2)
+FIRST_DAY = 1
+LAST_DAY = 25
+
+class PartResult:
+    """
+    The outcome of running a single part of a single day.
+
+    Attributes:
+        day (int): The day of the puzzle.
+        part (int): The part of the puzzle (1 or 2).
+        file_name (str): The input file the part was run against.
+        answer: The value returned by the solver, None if it failed.
+        wall_time (float): Elapsed wall clock time in seconds.
+        cpu_time (float): CPU time of the process in seconds.
+        peak_memory (int): Peak traced Python memory in bytes, None if
+            memory was not measured.
+        error (str): Description of the exception raised by the solver, if any.
+        cached (bool): True if the answer came from the result cache.
+    """
+    def __init__(self, day:int, part:int, file_name:str) -> None:
+        self.day = day
+        self.part = part
+        self.file_name = file_name
+        self.answer = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory = None
+        self.error = None
+        self.cached = False
+
+    def as_dict(self) -> dict:
+        """ Returns the result as a dictionary that can be serialised to JSON"""
+        return {
+            "day": self.day,
+            "part": self.part,
+            "file": self.file_name,
+            "answer": self.answer,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_memory": self.peak_memory,
+            "error": self.error,
+            "cached": self.cached,
+        }
+
+def parse_days(text:str) -> list:
+    """
+    Parses a day specification such as "1-14" or "1,3,5-7".
+
+    Args:
+        text (str): Comma separated list of days or inclusive day ranges.
+
+    Returns:
+        list: The sorted list of distinct days in the specification.
+
+    Raises:
+        ValueError: If the specification contains a day outside 1-25.
+    """
+    days = set()
+    for item in text.split(","):
+        item = item.strip()
+        if item == '':
+            continue
+        if "-" in item:
+            first, last = item.split("-", 1)
+            days.update(range(int(first), int(last) + 1))
+        else:
+            days.add(int(item))
+    for day in days:
+        if not FIRST_DAY <= day <= LAST_DAY:
+            raise ValueError(f"Day {day} is not between {FIRST_DAY} and {LAST_DAY}")
+    return sorted(days)
+
+def get_day_dir(day:int) -> str:
+    """ Returns the directory holding the solver for the given day"""
+    return os.path.join(REPO_ROOT, DAY_DIR_FORMAT.format(day))
+
+def find_days() -> list:
+    """
+    Finds every day that has a solver in the repository.
+
+    Returns:
+        list: The sorted list of days with an NNday/main.py file.
+    """
+    days = []
+    for day in range(FIRST_DAY, LAST_DAY + 1):
+        if os.path.isfile(os.path.join(get_day_dir(day), SOLVER_FILE_NAME)):
+            days.append(day)
+    return days
+
+def load_day(day:int):
+    """
+    Imports the solver for a day as a module.
+
+    Modules are registered in sys.modules as aoc_day_NN so repeated loads
+    return the module that has already been imported. If profiling is on,
+    the module's hot functions are instrumented.
+
+    Args:
+        day (int): The day to load.
+
+    Returns:
+        module: The imported NNday/main.py module.
+
+    Raises:
+        FileNotFoundError: If there is no solver for the day.
+    """
+    module_name = f"aoc_day_{day:02d}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    path = os.path.join(get_day_dir(day), SOLVER_FILE_NAME)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No solver for day {day}: {path}")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    profiling.instrument(module)
+    return module
+
+def unload_day(day:int) -> None:
+    """ Forgets a loaded day module so the next load_day imports it again"""
+    sys.modules.pop(f"aoc_day_{day:02d}", None)
+
+def resolve_input(day:int, file_name:str) -> str:
+    """
+    Finds the input file for a day.
+
+    Absolute paths and "-" (standard input) are returned unchanged. Relative
+    names are looked up in the day's directory, ignoring case, because some
+    days keep their input as Input.txt.
+
+    Args:
+        day (int): The day the input belongs to.
+        file_name (str): The file name or path of the input.
+
+    Returns:
+        str: The path of the input file.
+
+    Raises:
+        FileNotFoundError: If no matching file exists.
+    """
+    if os.path.isabs(file_name) or file_name == loader.STDIN_NAME:
+        return file_name
+    day_dir = get_day_dir(day)
+    path = os.path.join(day_dir, file_name)
+    if os.path.isfile(path):
+        return path
+    if os.path.isdir(day_dir):
+        for entry in sorted(os.listdir(day_dir)):
+            if entry.lower() == file_name.lower():
+                return os.path.join(day_dir, entry)
+    raise FileNotFoundError(f"No input {file_name} for day {day}")
+
+def resolve_test_input(day:int) -> str:
+    """ Returns the path of the example input for the day"""
+    for file_name in TEST_FILE_NAMES:
+        try:
+            return resolve_input(day, file_name)
+        except FileNotFoundError:
+            pass
+    raise FileNotFoundError(f"No test input for day {day}")
+
+def get_part_solver(module, part:int):
+    """ Returns the solver function for the part, None if it has not been written"""
+    return getattr(module, f"part_{part}", None)
+
+def normalise_answer(answer):
+    """
+    Converts a solver's answer into a plain int or str.
+
+    Some days return floats (numpy) or numpy integers; whole numbers are
+    reported as int so they compare equal across runs.
+    """
+    if isinstance(answer, (int, str)) or answer is None:
+        return answer
+    try:
+        as_float = float(answer)
+    except (TypeError, ValueError):
+        return str(answer)
+    if as_float.is_integer():
+        return int(as_float)
+    return as_float
+
+def run_part(day:int, part:int, file_name:str, measure_memory:bool = True,
+             cache = None) -> PartResult:
+    """
+    Runs one part of one day and measures it.
+
+    Anything the solver prints is discarded so that it does not interfere
+    with the runner's own output.
+
+    Args:
+        day (int): The day to run.
+        part (int): The part to run.
+        file_name (str): The path of the input file.
+        measure_memory (bool): Trace allocations to report peak memory. This
+            slows the solver down, so timings are less precise when enabled.
+        cache (aoc.cache.ResultCache): If given, a cached answer is returned
+            instead of running the solver, and new answers are stored. Inputs
+            that are not regular files are not cached, as hashing them would
+            consume them.
+
+    Returns:
+        PartResult: The answer and measurements. If the solver raised, the
+        error is recorded rather than propagated.
+    """
+    result = PartResult(day, part, file_name)
+    module = load_day(day)
+    solver = get_part_solver(module, part)
+    if solver is None:
+        result.error = f"Part {part} is not implemented"
+        return result
+    if measure_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        key = None
+        if cache is not None and os.path.isfile(file_name):
+            key = cache.get_key(day, part, file_name)
+            result.cached, result.answer = cache.get(key)
+        if not result.cached:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result.answer = normalise_answer(solver(file_name))
+            if key is not None:
+                cache.put(key, day, part, result.answer)
+    except Exception as error:   # pylint: disable=broad-exception-caught
+        result.error = f"{type(error).__name__}: {error}"
+    finally:
+        result.cpu_time = time.process_time() - start_cpu
+        result.wall_time = time.perf_counter() - start_wall
+        if measure_memory:
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result
+
+def run_task(task:tuple, measure_memory:bool = True, cache = None) -> tuple:
+    """
+    Runs a (day, part, path) task in a worker process.
+
+    Returns:
+        tuple: The PartResult and the changes to the cache counters made
+        in the worker, None if there is no cache.
+    """
+    before = None if cache is None else cache.stats()
+    result = run_part(*task, measure_memory, cache)
+    if cache is None:
+        return (result, None)
+    return (result, {name: count - before[name] for name, count in cache.stats().items()})
+
+def schedule_tasks(tasks:list, estimate = None) -> list:
+    """
+    Orders tasks longest first so the slowest parts start straight away.
+
+    Tasks without an estimate are treated as the longest. Ties keep their
+    original order, so the schedule is the same on every run.
+
+    Args:
+        tasks (list): The (day, part, path) tasks to order.
+        estimate (function): Returns the expected seconds for a day, part
+            and path, or None if it is not known.
+
+    Returns:
+        list: The tasks in the order they should be started.
+    """
+    def get_priority(indexed_task):
+        index, task = indexed_task
+        seconds = None if estimate is None else estimate(*task)
+        return (-math.inf if seconds is None else -seconds, index)
+    return [task for _, task in sorted(enumerate(tasks), key=get_priority)]
+
+def run_tasks(tasks:list, measure_memory:bool = True, cache = None, jobs:int = 1,
+              estimate = None) -> dict:
+    """
+    Runs (day, part, path) tasks, in this process or across worker processes.
+
+    With more than one job, tasks are started longest first (see
+    schedule_tasks) on a pool of jobs processes. Each worker measures its
+    own memory, and cache counters from the workers are added to cache.
+    Workers cannot read this process's standard input or pipes, so those
+    are first copied to a temporary file that the workers read instead.
+
+    Args:
+        tasks (list): The tasks to run.
+        measure_memory (bool): Trace allocations to report peak memory.
+        cache (aoc.cache.ResultCache): Result cache to use, if any.
+        jobs (int): The number of worker processes, 1 runs every task here.
+        estimate (function): Expected seconds for a task, see schedule_tasks.
+
+    Returns:
+        dict: Maps each task to its PartResult.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        return {task: run_part(*task, measure_memory, cache) for task in tasks}
+    finished = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for task in schedule_tasks(tasks, estimate):
+            day, part, path = task
+            worker_task = (day, part, loader.spool_input(path))
+            futures.append((task, pool.submit(run_task, worker_task, measure_memory, cache)))
+        for task, future in futures:
+            try:
+                result, counts = future.result()
+            except Exception as error:   # pylint: disable=broad-exception-caught
+                result, counts = PartResult(*task), None
+                result.error = f"{type(error).__name__}: {error}"
+            if counts is not None:
+                cache.add_stats(counts)
+            result.file_name = task[2]
+            finished[task] = result
+    return finished
+
+def run_days(days:list, file_name:str = DEFAULT_FILE_NAME, use_test_input:bool = False,
+             parts:tuple = PARTS, measure_memory:bool = True, cache = None, jobs:int = 1,
+             estimate = None) -> list:
+    """
+    Runs each requested part of each requested day.
+
+    Days without a solver are skipped. Days without the requested input, or
+    whose module fails to import, are reported as errors. However many jobs
+    are used, results come back in the same order.
+
+    Args:
+        days (list): The days to run.
+        file_name (str): The input file name, looked up in each day's directory.
+        use_test_input (bool): Use each day's example input instead of file_name.
+        parts (tuple): The parts to run.
+        measure_memory (bool): Trace allocations to report peak memory.
+        cache (aoc.cache.ResultCache): Result cache to use, if any.
+        jobs (int): The number of worker processes to run parts on.
+        estimate (function): Expected seconds for a day, part and path,
+            used to start the longest parts first when jobs > 1.
+
+    Returns:
+        list: A PartResult for each part run, in day then part order.
+    """
+    planned = []
+    available_days = find_days()
+    for day in days:
+        if day not in available_days:
+            continue
+        try:
+            if use_test_input:
+                path = resolve_test_input(day)
+            else:
+                path = resolve_input(day, file_name)
+            module = load_day(day)
+        except Exception as error:   # pylint: disable=broad-exception-caught
+            for part in parts:
+                result = PartResult(day, part, file_name)
+                result.error = f"{type(error).__name__}: {error}"
+                planned.append(result)
+            continue
+        for part in parts:
+            if get_part_solver(module, part) is None:
+                continue
+            planned.append((day, part, path))
+    tasks = [item for item in planned if isinstance(item, tuple)]
+    finished = run_tasks(tasks, measure_memory, cache, jobs, estimate)
+    return [finished[item] if isinstance(item, tuple) else item for item in planned]
+
+def format_memory(size) -> str:
+    """ Formats a size in bytes for display"""
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def format_table(results:list) -> str:
+    """
+    Formats results as a text table with one row per part.
+
+    Args:
+        results (list): The PartResult objects to format.
+
+    Returns:
+        str: The formatted table.
+    """
+    lines = [f"{'Day':>3} {'Part':>4} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak mem':>10}  Answer"]
+    for result in results:
+        answer = result.answer if result.error is None else f"ERROR {result.error}"
+        if result.cached:
+            answer = f"{answer} (cached)"
+        lines.append(f"{result.day:>3} {result.part:>4} {result.wall_time:>10.4f} "
+                     f"{result.cpu_time:>10.4f} {format_memory(result.peak_memory):>10}  {answer}")
+    total_wall = sum(result.wall_time for result in results)
+    total_cpu = sum(result.cpu_time for result in results)
+    lines.append(f"{'':>3} {'':>4} {total_wall:>10.4f} {total_cpu:>10.4f}")
+    return "\n".join(lines)
+
+def format_json(results:list, cache_stats:dict = None) -> str:
+    """ Formats results, and the result cache counters if any, as a JSON document"""
+    document = {
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "results": [result.as_dict() for result in results],
+    }
+    if cache_stats is not None:
+        document["cache"] = cache_stats
+    return json.dumps(document, indent=2)
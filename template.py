@@ -4,7 +4,6 @@ https://adventofcode.com/2024/day/x
 """
 import os
 import sys
-from itertools import product
 
 def get_directions(are_diagonals_valid = False) -> list:
     """
@@ -16,8 +15,9 @@ def get_directions(are_diagonals_valid = False) -> list:
         except (0, 0). Otherwise, includes only cardinal directions.
     """
     if are_diagonals_valid:
+        from itertools import product   # pylint: disable=import-outside-toplevel
         directions = list(product([-1, 0, 1], repeat=2))
-        directions.remove(0,0)
+        directions.remove((0,0))
     else:
         directions = [(-1,0),(1,0),(0,1),(0,-1)]
     return directions
@@ -51,6 +51,21 @@ def get_file_name() -> str:
         return DEFAULT_FILE_NAME
     return sys.argv[1]
 
+def part_1(file_name:str) -> int:
+    """ Solves Part 1 of the puzzle for the given input file
+        Called by main and by the shared runner (python -m aoc run)
+    """
+    file_data = read_input(file_name)
+    data_2d = [list(s.strip()) for s in file_data]
+    return 0
+
+def part_2(file_name:str) -> int:
+    """ Solves Part 2 of the puzzle for the given input file
+        Remove this function until Part 2 has been solved
+    """
+    file_data = read_input(file_name)
+    data_2d = [list(s.strip()) for s in file_data]
+    return 0
 
 def main():
     """ Main function
@@ -59,8 +74,8 @@ def main():
         
     """
     file_name = get_file_name()
-    file_data = read_input(file_name)
-    data_2d = [list(s.strip()) for s in file_data]
+    print(part_1(file_name))
+    print(part_2(file_name))
 
 if __name__ == "__main__":
     main()
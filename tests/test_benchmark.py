@@ -0,0 +1,35 @@
+"""
+Checks the run time estimates taken from a benchmark baseline
+"""
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import benchmark, runner  # pylint: disable=wrong-import-position
+
+BASELINE = {"entries": {"1.1": {"times": [0.5, 1.0], "sizes": [10, 20], "bytes": [100, 200],
+                                "growth": "O(n)"}}}
+
+class TestEstimateTime(unittest.TestCase):
+    def test_scales_with_input_size(self) -> None:
+        path = runner.resolve_test_input(1)
+        expected = 1.0 * os.path.getsize(path) / 200
+        self.assertAlmostEqual(benchmark.estimate_time(BASELINE, 1, 1, path), expected)
+
+    def test_unknown_part(self) -> None:
+        self.assertIsNone(benchmark.estimate_time(BASELINE, 1, 2, runner.resolve_test_input(1)))
+
+    def test_standard_input(self) -> None:
+        self.assertIsNone(benchmark.estimate_time(BASELINE, 1, 1, "-"))
+
+    def test_pipe(self) -> None:
+        read_end, write_end = os.pipe()
+        try:
+            self.assertIsNone(benchmark.estimate_time(BASELINE, 1, 1, f"/dev/fd/{read_end}"))
+        finally:
+            os.close(read_end)
+            os.close(write_end)
+
+if __name__ == "__main__":
+    unittest.main()
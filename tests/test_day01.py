@@ -0,0 +1,65 @@
+"""
+Checks the incremental Day 1 location lists against a brute-force recount
+"""
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import runner  # pylint: disable=wrong-import-position
+
+SEED = 2024
+UPDATES = 400
+
+def get_distance(left:list, right:list) -> int:
+    """ Sums the gaps between the lists sorted side by side"""
+    return sum(abs(first - second) for first, second in zip(sorted(left), sorted(right)))
+
+def get_similarity(left:list, right:list) -> int:
+    """ Sums each left ID times the number of times it is in the right list"""
+    right_counts = Counter(right)
+    return sum(num * right_counts[num] for num in left)
+
+class TestLocationLists(unittest.TestCase):
+    def check_updates(self, block_size:int, max_id:int, start_pairs:int) -> None:
+        """ Adds and removes random pairs, comparing the totals after every update"""
+        day = runner.load_day(1)
+        lists_class = type("SmallBlockLists", (day.LocationLists,),
+                           {"MIN_BLOCK_SIZE": block_size})
+        rng = random.Random(SEED + block_size + max_id)
+        left = [rng.randint(0, max_id) for _ in range(start_pairs)]
+        right = [rng.randint(0, max_id) for _ in range(start_pairs)]
+        lists = lists_class(left, right)
+        for _ in range(UPDATES):
+            if left and rng.random() < 0.45:
+                pair = (left.pop(rng.randrange(len(left))), right.pop(rng.randrange(len(right))))
+                lists.remove(*pair)
+            else:
+                pair = (rng.randint(0, max_id), rng.randint(0, max_id))
+                left.append(pair[0])
+                right.append(pair[1])
+                lists.add(*pair)
+            self.assertEqual((lists.distance(), lists.similarity()),
+                             (get_distance(left, right), get_similarity(left, right)),
+                             f"after {pair}")
+
+    def test_small_blocks(self) -> None:
+        for block_size in (1, 2, 3):
+            with self.subTest(block_size=block_size):
+                self.check_updates(block_size, 40, 10)
+
+    def test_default_blocks(self) -> None:
+        for max_id, start_pairs in ((20, 0), (1000, 200), (99999, 50)):
+            with self.subTest(max_id=max_id, start_pairs=start_pairs):
+                self.check_updates(runner.load_day(1).LocationLists.MIN_BLOCK_SIZE,
+                                   max_id, start_pairs)
+
+    def test_remove_missing_pair(self) -> None:
+        lists = runner.load_day(1).LocationLists([1, 2], [3, 4])
+        with self.assertRaises(ValueError):
+            lists.remove(3, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Checks the Day 2 safety checks against brute-force removal of levels
+"""
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import runner  # pylint: disable=wrong-import-position
+
+SEED = 2024
+REPORTS = 3000
+
+def is_safe_brute_force(levels:list, removals:int, min_step:int, max_step:int) -> bool:
+    """ Tries every way of removing at most removals levels"""
+    for removed in range(min(removals, len(levels)) + 1):
+        for kept in itertools.combinations(levels, len(levels) - removed):
+            steps = [second - first for first, second in zip(kept, kept[1:])]
+            if (all(min_step <= step <= max_step for step in steps)
+                    or all(min_step <= -step <= max_step for step in steps)):
+                return True
+    return False
+
+def make_levels(rng:random.Random) -> list:
+    """ Returns a report that is often nearly safe, so single removals matter"""
+    levels = [rng.randint(0, 20)]
+    direction = rng.choice((1, -1))
+    for _ in range(rng.randint(0, 8)):
+        levels.append(levels[-1] + direction * rng.randint(0, 4) if rng.random() < 0.85
+                      else rng.randint(0, 20))
+    return levels
+
+class TestIsSafeLevels(unittest.TestCase):
+    def test_matches_brute_force(self) -> None:
+        day = runner.load_day(2)
+        rng = random.Random(SEED)
+        for _ in range(REPORTS):
+            levels = make_levels(rng)
+            removals = rng.randint(0, 3)
+            min_step = rng.randint(0, 2)
+            max_step = min_step + rng.randint(0, 3)
+            self.assertEqual(day.is_safe_levels(levels, removals, min_step, max_step),
+                             is_safe_brute_force(levels, removals, min_step, max_step),
+                             f"{levels} removals={removals} steps={min_step}-{max_step}")
+
+def make_text(rng:random.Random) -> bytes:
+    """
+    Returns report lines with the awkward cases the batch parser handles:
+    blank and blank-led lines, tabs, CR line endings, negative and long
+    levels, and sometimes no final line break.
+    """
+    lines = []
+    for _ in range(rng.randint(0, 40)):
+        levels = make_levels(rng)
+        if rng.random() < 0.1:
+            levels = [level - 10 for level in levels]
+        if rng.random() < 0.05:
+            levels = [level + 12_345_678_900 for level in levels]
+        separators = [rng.choice((" ", " ", " ", "  ", "\t")) for _ in levels]
+        line = "".join(separator + str(level) for separator, level in zip(separators, levels))
+        line = line[1:] if rng.random() < 0.8 else line
+        if rng.random() < 0.05:
+            line = ""
+        lines.append(line + ("\r" if rng.random() < 0.1 else ""))
+    text = "\n".join(lines)
+    if lines and rng.random() < 0.8:
+        text += "\n"
+    return text.encode()
+
+class TestFindSafeReports(unittest.TestCase):
+    def test_matches_report_at_a_time(self) -> None:
+        day = runner.load_day(2)
+        rng = random.Random(SEED)
+        for _ in range(300):
+            text = make_text(rng)
+            # Nothing after the last line break is not a report
+            reports = text.split(b"\n")
+            if not reports[-1]:
+                reports.pop()
+            for removals in (0, 1):
+                expected = sum(day.is_safe_levels(day.get_levels(report), removals)
+                               for report in reports)
+                self.assertEqual(day.count_safe_batches([text], removals), expected,
+                                 f"{text!r} removals={removals}")
+
+if __name__ == "__main__":
+    unittest.main()
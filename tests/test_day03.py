@@ -0,0 +1,92 @@
+"""
+Checks the chunked and ranged Day 3 scanners against a brute-force scan
+"""
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import runner  # pylint: disable=wrong-import-position
+
+SEED = 2024
+MEMORIES = 300
+FRAGMENTS = (b"mul(", b"mul(12,3)", b"mul(999,999)", b"mul(1234,5)", b"mu", b"l(", b"do()",
+             b"don't()", b"do(", b"don", b"'t()", b"7", b"42", b",", b")", b"(", b"x", b"\n",
+             b"add(4,5)", b"sub(9,", b"neg(7)", b"max(1,2,3)")
+
+def scan_brute_force(memory:bytes, instructions) -> tuple:
+    """ Tries every instruction at every offset, keeping the enable state as it goes"""
+    patterns = [(re.compile(instruction.pattern), instruction) for instruction in instructions]
+    total = 0
+    enabled_total = 0
+    enabled = True
+    position = 0
+    while position < len(memory):
+        for pattern, instruction in patterns:
+            match = pattern.match(memory, position)
+            if match is not None:
+                break
+        else:
+            position += 1
+            continue
+        position = match.end()
+        if instruction.operation is None:
+            enabled = instruction.enables
+            continue
+        value = instruction.operation(*[int(operand) for operand in match.groups()])
+        total += value
+        if enabled:
+            enabled_total += value
+    return total, enabled_total
+
+def make_memory(rng:random.Random) -> bytes:
+    """ Returns a soup of whole and broken instruction tokens"""
+    return b"".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 60)))
+
+def split_offsets(rng:random.Random, size:int) -> list:
+    """ Returns sorted cut points from 0 to size, with random ranges between them"""
+    cuts = sorted(rng.randint(0, size) for _ in range(rng.randint(0, 8)))
+    return [0] + cuts + [size]
+
+class Day3TestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.day = runner.load_day(3)
+        self.rng = random.Random(SEED)
+        extended = self.day.InstructionSet(self.day.INSTRUCTIONS)
+        for instruction in self.day.EXTRA_INSTRUCTIONS:
+            extended.register(instruction)
+        self.instruction_sets = (self.day.INSTRUCTIONS, extended)
+
+class TestScanMemory(Day3TestCase):
+    def test_random_chunks(self) -> None:
+        for _ in range(MEMORIES):
+            memory = make_memory(self.rng)
+            offsets = split_offsets(self.rng, len(memory))
+            chunks = [memory[start:end] for start, end in zip(offsets, offsets[1:])]
+            for instructions in self.instruction_sets:
+                self.assertEqual(self.day.scan_memory(chunks, instructions),
+                                 scan_brute_force(memory, instructions), f"{chunks!r}")
+
+    def test_fixed_chunk_sizes(self) -> None:
+        memory = b"".join(make_memory(self.rng) for _ in range(20))
+        expected = scan_brute_force(memory, self.day.INSTRUCTIONS)
+        for size in (1, 2, 3, 7, 11, 64):
+            chunks = [memory[start:start + size] for start in range(0, len(memory), size)]
+            with self.subTest(size=size):
+                self.assertEqual(self.day.scan_memory(chunks), expected)
+
+class TestScanRanges(Day3TestCase):
+    def test_random_ranges(self) -> None:
+        for _ in range(MEMORIES):
+            memory = make_memory(self.rng)
+            offsets = split_offsets(self.rng, len(memory))
+            for instructions in self.instruction_sets:
+                scans = [self.day.scan_range(memory, start, end, instructions)
+                         for start, end in zip(offsets, offsets[1:])]
+                self.assertEqual(self.day.combine_scans(scans),
+                                 scan_brute_force(memory, instructions), f"{memory!r} {offsets}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Checks the Day 6 jump table against walking the guard one step at a time
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import loader, runner  # pylint: disable=wrong-import-position
+
+SEED = 2024
+GRIDS = 1000
+MAX_SIZE = 12
+# Clockwise from up, as (y, x) steps
+STEPS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+def walk(rows:list, start:tuple, direction:int, obstacle:tuple = None) -> set:
+    """ Returns the cells the guard visits, or None if it walks in a loop"""
+    (y, x), seen = start, set()
+    while (y, x, direction) not in seen:
+        seen.add((y, x, direction))
+        step_y, step_x = STEPS[direction]
+        ahead_y, ahead_x = y + step_y, x + step_x
+        if not (0 <= ahead_y < len(rows) and 0 <= ahead_x < len(rows[0])):
+            return {(y, x) for y, x, _ in seen}
+        if rows[ahead_y][ahead_x] == "#" or (ahead_y, ahead_x) == obstacle:
+            direction = (direction + 1) % len(STEPS)
+        else:
+            y, x = ahead_y, ahead_x
+    return None
+
+def make_rows(rng:random.Random) -> tuple:
+    """ Returns a random map with the guard on it, and the guard's cell and direction"""
+    height, width = rng.randint(1, MAX_SIZE), rng.randint(1, MAX_SIZE)
+    density = rng.uniform(0.05, 0.35)
+    rows = [["#" if rng.random() < density else "." for _ in range(width)]
+            for _ in range(height)]
+    start = (rng.randrange(height), rng.randrange(width))
+    direction = rng.randrange(len(STEPS))
+    rows[start[0]][start[1]] = "^>v<"[direction]
+    return ["".join(row) for row in rows], start, direction
+
+def make_grid(rows:list) -> loader.Grid:
+    """ Lays the rows out the way open_input maps an input file"""
+    cols = len(rows[0])
+    return loader.Grid(("\n".join(rows) + "\n").encode(), cols, cols + 1, len(rows))
+
+class TestGuardMap(unittest.TestCase):
+    def test_matches_step_by_step_walk(self) -> None:
+        day = runner.load_day(6)
+        rng = random.Random(SEED)
+        for _ in range(GRIDS):
+            rows, start, direction = make_rows(rng)
+            grid = make_grid(rows)
+            guard = day.find_position_and_direction(grid, grid.rows, grid.cols)
+            visited = walk(rows, start, direction)
+            message = "\n" + "\n".join(rows)
+            if visited is None:
+                with self.assertRaises(ValueError, msg=message):
+                    day.move_and_count_blocks(grid, guard)
+                continue
+            blocks = sum(walk(rows, start, direction, (y, x)) is None
+                         for y, row in enumerate(rows) for x, cell in enumerate(row)
+                         if cell == ".")
+            self.assertEqual(day.move_and_count(grid, guard), len(visited), message)
+            self.assertEqual(day.move_and_count_blocks(grid, guard), blocks, message)
+
+if __name__ == "__main__":
+    unittest.main()
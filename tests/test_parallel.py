@@ -0,0 +1,55 @@
+"""
+Runs the parallel paths of the day solvers with spawned worker processes
+
+Spawned workers start with a fresh interpreter, so they only work if they
+can import the day modules that runner.load_day registers.
+"""
+import multiprocessing
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import runner  # pylint: disable=wrong-import-position
+
+JOBS = 2
+
+class SpawnTestCase(unittest.TestCase):
+    """ Forces the spawn start method for each test"""
+    def setUp(self) -> None:
+        self.start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method("spawn", force=True)
+
+    def tearDown(self) -> None:
+        multiprocessing.set_start_method(self.start_method, force=True)
+
+    def get_test_path(self, day:int) -> str:
+        """ Returns the absolute path of a day's test input"""
+        return os.path.abspath(runner.resolve_test_input(day))
+
+class TestSpawnedDay3(SpawnTestCase):
+    def test_scan_parallel(self) -> None:
+        day = runner.load_day(3)
+        path = self.get_test_path(3)
+        size = os.path.getsize(path)
+        self.assertEqual(day.scan_parallel(path, size, JOBS), day.scan_file(path, jobs=1))
+
+class TestSpawnedDay4(SpawnTestCase):
+    def test_count_stencils_tiled(self) -> None:
+        day = runner.load_day(4)
+        data = day.open_input(self.get_test_path(4))
+        for stencils, expected in ((day.XMAS_STENCILS, 18), (day.CROSS_STENCILS, 9)):
+            with self.subTest(expected=expected):
+                self.assertEqual(day.count_stencils_tiled(data, stencils, band_cells=30,
+                                                          jobs=JOBS), expected)
+
+class TestSpawnedDay5(SpawnTestCase):
+    def test_sum_updates_parallel(self) -> None:
+        day = runner.load_day(5)
+        lines = day.read_input(self.get_test_path(5))
+        rules = day.get_rules(lines)
+        updates = day.get_updates(lines)
+        self.assertEqual(day.get_sum_of_valid_updates(updates, rules, jobs=JOBS), (143, 123))
+
+if __name__ == "__main__":
+    unittest.main()
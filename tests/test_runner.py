@@ -0,0 +1,34 @@
+"""
+Runs the command line runner on inputs that can only be read once
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+from aoc import runner  # pylint: disable=wrong-import-position
+
+class TestStandardInput(unittest.TestCase):
+    def run_from_stdin(self, day:int, jobs:int) -> list:
+        """ Pipes a day's example input to python -m aoc run and returns the answers"""
+        with open(runner.resolve_test_input(day), "rb") as data:
+            completed = subprocess.run([sys.executable, "-m", "aoc", "run", str(day),
+                                        "--input", "-", "--jobs", str(jobs), "--no-cache",
+                                        "--no-memory", "--json"],
+                                       stdin=data, capture_output=True, cwd=REPO_DIR, check=True)
+        results = json.loads(completed.stdout)["results"]
+        self.assertEqual([result["error"] for result in results], [None, None])
+        self.assertEqual([result["file"] for result in results], ["-", "-"])
+        return [result["answer"] for result in results]
+
+    def test_one_job(self) -> None:
+        self.assertEqual(self.run_from_stdin(1, 1), [11, 31])
+
+    def test_parallel_jobs(self) -> None:
+        self.assertEqual(self.run_from_stdin(1, 2), [11, 31])
+
+if __name__ == "__main__":
+    unittest.main()